@@ -1,8 +1,15 @@
+from array import array
+import bisect
+
 class TreeNode:
+    __slots__ = ('key', 'left', 'right', 'height', 'size')
+
     def __init__(self, key):
         self.key = key
         self.left = None
         self.right = None
+        self.height = 1
+        self.size = 1
         
     def __str__(self):
         return str(self.key)
@@ -10,76 +17,408 @@ class TreeNode:
 class BinarySearchTree:
     def __init__(self):
         self.root = None
-        
-    def _insert(self, node, key):
-        if node is None:
-            return TreeNode(key)
-        if key < node.key:
-            node.left = self._insert(node.left, key)
-        elif key > node.key:
-            node.right = self._insert(node.right, key)
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        # builds a perfectly balanced tree from strictly increasing keys in O(n)
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if not keys[i - 1] < keys[i]:
+                raise ValueError("Keys must be sorted and unique")
+        tree = cls()
+        tree.root = tree._build(keys, 0, len(keys))
+        return tree
+
+    def _build(self, keys, lo, hi):
+        if lo >= hi:
+            return None
+        middle = (lo + hi) // 2
+        node = TreeNode(keys[middle])
+        node.left = self._build(keys, lo, middle)
+        node.right = self._build(keys, middle + 1, hi)
+        self._update(node)
         return node
+
+    def _size(self, node):
+        return node.size if node else 0
+
+    def _update(self, node):
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+
+    # insert/delete walk down iteratively and remember the nodes they passed
+    # in `path`, so the subtree sizes can be fixed up on the way back.
+    def _retrace(self, path):
+        for node in reversed(path):
+            self._update(node)
+
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
     
     def insert(self, key):
-        self.root = self._insert(self.root, key)
-        
-    def _search(self, node, key):
-        if node is None or node.key == key:
-            return node
-        if key < node.key:
-            return self._search(node.left, key)
-        return self._search(node.right, key)
+        path = []
+        node = self.root
+        while node is not None:
+            if key == node.key:
+                return
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        new_node = TreeNode(key)
+        if not path:
+            self.root = new_node
+        elif key < path[-1].key:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+        self._retrace(path)
     
     def search(self, key):
-        return self._search(self.root, key)
-    
-    def _min_value(self, node):
-        while node.left is not None:
-            node = node.left
-        return node.key
-    
-    def _delete(self, node, key):
-        if node is None:
-            return node
-        if key < node.key:
-            node.left = self._delete(node.left, key)
-        elif key > node.key:
-            node.right = self._delete(node.right, key)
-        else:
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-            node.key = self._min_value(node.right)
-            node.right = self._delete(node.right, node.key)
+        node = self.root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
         return node
     
     def delete(self, key):
-        self.root = self._delete(self.root, key)
-        
-    def _inorder_traversal(self, node, result):
-        if node:
-            self._inorder_traversal(node.left, result)
-            result.append(node.key)
-            self._inorder_traversal(node.right, result)
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return
+        if node.left is not None and node.right is not None:
+            # copy the in-order successor into node, then unlink the successor
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key = successor.key
+            node = successor
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+        self._retrace(path)
+
+    def iter_inorder(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                yield node.key
+                node = node.right
             
     def inorder_traversal(self):
-        result = []
-        self._inorder_traversal(self.root, result)
+        return list(self.iter_inorder())
+
+    def range(self, lo, hi):
+        # yields the keys with lo <= key <= hi in order, skipping subtrees below lo
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                if node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if node.key > hi:
+                    return
+                yield node.key
+                node = node.right
+
+    def _count_below(self, key, inclusive):
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.key < key or (inclusive and node.key == key):
+                count += self._size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def __len__(self):
+        return self._size(self.root)
+
+    def rank(self, key):
+        # number of keys smaller than key
+        return self._count_below(key, False)
+
+    def select(self, k):
+        # k-th smallest key, counting from 0
+        if not 0 <= k < len(self):
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.key
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def count_range(self, lo, hi):
+        # number of keys with lo <= key <= hi
+        if hi < lo:
+            return 0
+        return self._count_below(hi, True) - self._count_below(lo, False)
+
+    def floor(self, key):
+        # largest key <= key, or None
+        result = None
+        node = self.root
+        while node is not None:
+            if node.key == key:
+                return node.key
+            if node.key < key:
+                result = node.key
+                node = node.right
+            else:
+                node = node.left
         return result
-    
-bst = BinarySearchTree()
-nodes = [50, 30, 20, 40, 70, 60, 80]
 
-for node in nodes:
-    bst.insert(node)
+    def ceiling(self, key):
+        # smallest key >= key, or None
+        result = None
+        node = self.root
+        while node is not None:
+            if node.key == key:
+                return node.key
+            if node.key > key:
+                result = node.key
+                node = node.left
+            else:
+                node = node.right
+        return result
     
-print('Search for 80:', bst.search(80))
+class AVLTree(BinarySearchTree):
+    # Rebalances on every insert/delete so the heights of the two subtrees of
+    # any node differ by at most one. Sorted input stays O(log n) deep instead
+    # of degrading into a linked list.
+
+    def _height(self, node):
+        return node.height if node else 0
+
+    def _update(self, node):
+        super()._update(node)
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+
+    def _balance_factor(self, node):
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        if node is None:
+            return node
+        self._update(node)
+        balance = self._balance_factor(node)
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _retrace(self, path):
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            balanced = self._rebalance(node)
+            if balanced is not node:
+                self._replace_child(path[i - 1] if i else None, node, balanced)
+
+
+class SortedArrayIndex:
+    # Same ordered API as BinarySearchTree, but the keys live in one flat
+    # sorted sequence (an array when a typecode is given) instead of one
+    # TreeNode per key. Lookups are binary searches; inserts and deletes
+    # shift the tail of the sequence, so it suits build-once, read-mostly data.
+
+    def __init__(self, typecode=None):
+        self.keys = array(typecode) if typecode else []
+
+    @classmethod
+    def from_sorted(cls, iterable, typecode=None):
+        index = cls(typecode)
+        index.keys.extend(iterable)
+        keys = index.keys
+        for i in range(1, len(keys)):
+            if not keys[i - 1] < keys[i]:
+                raise ValueError("Keys must be sorted and unique")
+        return index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def insert(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            self.keys.insert(i, key)
+
+    def search(self, key):
+        # a TreeNode like BinarySearchTree.search, so a found key 0 is still
+        # truthy; the node stands alone (no children), the keys hold no nodes
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return TreeNode(self.keys[i])
+        return None
+
+    def delete(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+    def iter_inorder(self):
+        return iter(self.keys)
+
+    def inorder_traversal(self):
+        return list(self.keys)
+
+    def range(self, lo, hi):
+        start = bisect.bisect_left(self.keys, lo)
+        stop = bisect.bisect_right(self.keys, hi)
+        for i in range(start, stop):
+            yield self.keys[i]
+
+    def floor(self, key):
+        i = bisect.bisect_right(self.keys, key)
+        return self.keys[i - 1] if i else None
+
+    def ceiling(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        return self.keys[i] if i < len(self.keys) else None
+
+    def rank(self, key):
+        return bisect.bisect_left(self.keys, key)
+
+    def select(self, k):
+        if not 0 <= k < len(self.keys):
+            raise IndexError("select index out of range")
+        return self.keys[k]
+
+    def count_range(self, lo, hi):
+        if hi < lo:
+            return 0
+        return bisect.bisect_right(self.keys, hi) - bisect.bisect_left(self.keys, lo)
+
+
+def benchmark(number_of_keys=1_000_000):
+    import itertools
+    import random
+    import time
+    import tracemalloc
+
+    tree = AVLTree()
+    start = time.perf_counter()
+    for key in range(number_of_keys):
+        tree.insert(key)
+    elapsed = time.perf_counter() - start
+    print(f"AVLTree: inserted {number_of_keys} sorted keys in {elapsed:.2f} s (height {tree.root.height})")
+
+    start = time.perf_counter()
+    for key in range(0, number_of_keys, 1000):
+        tree.search(key)
+    elapsed = time.perf_counter() - start
+    lookups = len(range(0, number_of_keys, 1000))
+    print(f"AVLTree: {lookups} lookups in {elapsed * 1e6 / lookups:.2f} µs each")
+
+    start = time.perf_counter()
+    first_keys = list(itertools.islice(tree.range(number_of_keys // 2, number_of_keys), 500))
+    elapsed = time.perf_counter() - start
+    print(f"AVLTree: first {len(first_keys)} keys of a range scan in {elapsed * 1e3:.2f} ms")
+
+    start = time.perf_counter()
+    tree.inorder_traversal()
+    elapsed = time.perf_counter() - start
+    print(f"AVLTree: full inorder traversal in {elapsed * 1e3:.2f} ms")
+
+    # Sorted keys turn the unbalanced tree into a linked list.
+    small = 5000
+    for tree in (BinarySearchTree(), AVLTree()):
+        for key in range(small):
+            tree.insert(key)
+        start = time.perf_counter()
+        for key in range(small):
+            tree.search(key)
+        elapsed = time.perf_counter() - start
+        print(f"{tree.__class__.__name__}: {small} lookups on {small} sorted keys in {elapsed * 1e3:.2f} ms")
+
+    # Bulk-loaded tree against the flat index: build time, memory and lookups.
+    probes = [random.randrange(number_of_keys) for _ in range(100_000)]
+    builders = [
+        ("BinarySearchTree.from_sorted", lambda: BinarySearchTree.from_sorted(range(number_of_keys))),
+        ("SortedArrayIndex (list)", lambda: SortedArrayIndex.from_sorted(range(number_of_keys))),
+        ("SortedArrayIndex ('q')", lambda: SortedArrayIndex.from_sorted(range(number_of_keys), "q")),
+    ]
+    for name, build in builders:
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = build()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name}: built {number_of_keys} keys in {elapsed:.2f} s, peak {peak / 2**20:.1f} MiB")
+
+        start = time.perf_counter()
+        for key in probes:
+            index.search(key)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {len(probes)} random lookups in {elapsed * 1e6 / len(probes):.2f} µs each")
+        del index
+
+
+def main():
+    bst = BinarySearchTree()
+    nodes = [50, 30, 20, 40, 70, 60, 80]
+
+    for node in nodes:
+        bst.insert(node)
+        
+    print('Search for 80:', bst.search(80))
+
+    print('Inorder traversal:', bst.inorder_traversal())
+
+    bst.delete(40)
+
+    print("Search for 40: ", bst.search(40))
 
-print('Inorder traversal:', bst.inorder_traversal())
+    print('Rank of 60:', bst.rank(60), '| 2nd smallest:', bst.select(1), '| keys in [25, 65]:', bst.count_range(25, 65))
 
-bst.delete(40)
+    print('Inorder traversal after deleting 40:', bst.inorder_traversal())
 
-print("Search for 40: ", bst.search(40))
+if __name__ == "__main__":
+    import sys
 
-print('Inorder traversal after deleting 40:', bst.inorder_traversal())
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
@@ -1,3 +1,11 @@
+import math
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # only the batch API needs NumPy
+    np = None
+
 def square_root_bisection(square_target, tolerance = 1e-7, max_iterations = 100):
     if square_target < 0:
         raise ValueError("Square root of negative number is not defined in real numbers")
@@ -27,4 +35,233 @@ def square_root_bisection(square_target, tolerance = 1e-7, max_iterations = 100)
             print(f"The square root of {square_target} is approximately {root}")
     return root
 
-square_root_bisection(int(input("Enter the number: ")))
\ No newline at end of file
+def square_root_bisection_batch(square_targets, tolerance = 1e-7, max_iterations = 100, return_iterations = False):
+    # Runs the same bisection as square_root_bisection on every target at once.
+    # Elements leave the working set as soon as they converge; targets that
+    # never converge get NaN. Nothing is printed.
+    if np is None:
+        raise ImportError("square_root_bisection_batch requires NumPy")
+    targets = np.asarray(square_targets, dtype=float)
+    if np.any(targets < 0):
+        raise ValueError("Square root of negative number is not defined in real numbers")
+
+    roots = np.full(targets.shape, np.nan)
+    iterations = np.zeros(targets.shape, dtype=np.int64)
+    flat_targets = targets.ravel()
+    flat_roots = roots.ravel()
+    flat_iterations = iterations.ravel()
+
+    trivial = (flat_targets == 0) | (flat_targets == 1)
+    flat_roots[trivial] = flat_targets[trivial]
+
+    index = np.flatnonzero(~trivial)
+    target = flat_targets[index]
+    low = np.zeros_like(target)
+    high = np.maximum(1, target)
+    for _ in range(max_iterations):
+        if index.size == 0:
+            break
+        mid = (low + high) / 2
+        square_mid = mid**2
+        flat_iterations[index] += 1
+        converged = np.abs(square_mid - target) < tolerance
+        flat_roots[index[converged]] = mid[converged]
+        below = square_mid < target
+        low = np.where(below, mid, low)
+        high = np.where(below, high, mid)
+        active = ~converged
+        index, target, low, high = index[active], target[active], low[active], high[active]
+
+    if return_iterations:
+        return roots, iterations
+    return roots
+
+# General bracketing root finding. Every method keeps a bracket [lo, hi] with
+# f(lo) and f(hi) of opposite signs and stops once the bracket (or the last
+# step) is smaller than xtol + rtol * |x|, so large roots converge on a
+# relative scale instead of an absolute residual.
+
+def _bisection(f, fprime, lo, hi, f_lo, f_hi, tolerance, max_iterations):
+    mid = lo
+    for iteration in range(1, max_iterations + 1):
+        mid = (lo + hi) / 2
+        f_mid = f(mid)
+        # the bracket may be given in either order
+        if f_mid == 0 or abs(hi - lo) / 2 < tolerance(mid):
+            return mid, iteration, True
+        if (f_mid < 0) == (f_lo < 0):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+    return mid, max_iterations, False
+
+def _illinois(f, fprime, lo, hi, f_lo, f_hi, tolerance, max_iterations):
+    # Regula falsi that halves the function value kept at a bracket end when
+    # that end survives two steps in a row, so both ends keep moving.
+    x = hi
+    for iteration in range(1, max_iterations + 1):
+        x = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+        f_x = f(x)
+        if f_x == 0:
+            return x, iteration, True
+        if (f_x < 0) != (f_hi < 0):
+            lo, f_lo = hi, f_hi
+        else:
+            f_lo /= 2
+        hi, f_hi = x, f_x
+        if abs(hi - lo) < tolerance(x):
+            return x, iteration, True
+    return x, max_iterations, False
+
+def _brent(f, fprime, lo, hi, f_lo, f_hi, tolerance, max_iterations):
+    # Inverse quadratic interpolation and secant steps, falling back to
+    # bisection whenever they would not shrink the bracket fast enough.
+    a, b, f_a, f_b = lo, hi, f_lo, f_hi
+    c, f_c = b, f_b
+    d = e = b - a
+    for iteration in range(1, max_iterations + 1):
+        if (f_b > 0) == (f_c > 0):
+            c, f_c = a, f_a
+            d = e = b - a
+        if abs(f_c) < abs(f_b):
+            a, b, c = b, c, b
+            f_a, f_b, f_c = f_b, f_c, f_b
+        tol = tolerance(b) / 2
+        half_width = (c - b) / 2
+        if abs(half_width) <= tol or f_b == 0:
+            return b, iteration, True
+        if abs(e) >= tol and abs(f_a) > abs(f_b):
+            s = f_b / f_a
+            if a == c:
+                p = 2 * half_width * s
+                q = 1 - s
+            else:
+                q = f_a / f_c
+                r = f_b / f_c
+                p = s * (2 * half_width * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * half_width * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = half_width
+        else:
+            d = e = half_width
+        a, f_a = b, f_b
+        b += d if abs(d) > tol else math.copysign(tol, half_width)
+        f_b = f(b)
+    return b, max_iterations, False
+
+def _newton(f, fprime, lo, hi, f_lo, f_hi, tolerance, max_iterations):
+    # Newton steps that are replaced by bisection whenever they would leave
+    # the bracket or are not shrinking quickly enough.
+    if fprime is None:
+        raise ValueError("method='newton' requires the derivative 'fprime'")
+    low, high = (lo, hi) if f_lo < 0 else (hi, lo)
+    x = (lo + hi) / 2
+    step = previous_step = abs(hi - lo)
+    f_x, df_x = f(x), fprime(x)
+    for iteration in range(1, max_iterations + 1):
+        out_of_bracket = ((x - high) * df_x - f_x) * ((x - low) * df_x - f_x) > 0
+        if out_of_bracket or abs(2 * f_x) > abs(previous_step * df_x):
+            previous_step = step
+            step = (high - low) / 2
+            x = low + step
+        else:
+            previous_step = step
+            step = f_x / df_x
+            x -= step
+        if abs(step) < tolerance(x):
+            return x, iteration, True
+        f_x, df_x = f(x), fprime(x)
+        if f_x == 0:
+            return x, iteration, True
+        if f_x < 0:
+            low = x
+        else:
+            high = x
+    return x, max_iterations, False
+
+ROOT_METHODS = {
+    "bisection": _bisection,
+    "illinois": _illinois,
+    "brent": _brent,
+    "newton": _newton,
+}
+
+def find_root(f, lo, hi, *, xtol = 1e-12, rtol = 4 * sys.float_info.epsilon, method = "brent", fprime = None, max_iterations = 100):
+    if method not in ROOT_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {', '.join(ROOT_METHODS)}")
+
+    counts = {"function_calls": 0, "derivative_calls": 0}
+
+    def counted_f(x):
+        counts["function_calls"] += 1
+        return f(x)
+
+    def counted_fprime(x):
+        counts["derivative_calls"] += 1
+        return fprime(x)
+
+    def tolerance(x):
+        return xtol + rtol * abs(x)
+
+    f_lo, f_hi = counted_f(lo), counted_f(hi)
+    if f_lo == 0 or f_hi == 0:
+        root, iterations, converged = (lo if f_lo == 0 else hi), 0, True
+    elif (f_lo < 0) == (f_hi < 0):
+        raise ValueError("f(lo) and f(hi) must have opposite signs")
+    else:
+        solve = ROOT_METHODS[method]
+        root, iterations, converged = solve(
+            counted_f, counted_fprime if fprime else None, lo, hi, f_lo, f_hi, tolerance, max_iterations
+        )
+    return {"root": root, "converged": converged, "iterations": iterations, **counts}
+
+def square_root(square_target, method = "brent", **kwargs):
+    if square_target < 0:
+        raise ValueError("Square root of negative number is not defined in real numbers")
+    return find_root(
+        lambda x: x * x - square_target,
+        0, max(1, square_target),
+        method=method,
+        fprime=lambda x: 2 * x,
+        **kwargs,
+    )
+
+def benchmark():
+    import time
+
+    problems = [(f"sqrt({t:g})", lambda x, t=t: x * x - t, lambda x: 2 * x, 0, max(1, t)) for t in (2, 10, 12345.678, 1e12)]
+    problems += [
+        ("cos(x) - x", lambda x: math.cos(x) - x, lambda x: -math.sin(x) - 1, 0, 1),
+        ("x^3 - 2x - 5", lambda x: x**3 - 2 * x - 5, lambda x: 3 * x**2 - 2, 2, 3),
+        ("exp(x) - 1e3", lambda x: math.exp(x) - 1e3, math.exp, 0, 20),
+    ]
+    print(f"{'problem':<16}" + "".join(f"{method:>12}" for method in ROOT_METHODS))
+    totals = dict.fromkeys(ROOT_METHODS, 0)
+    for name, f, fprime, lo, hi in problems:
+        row = f"{name:<16}"
+        for method in ROOT_METHODS:
+            result = find_root(f, lo, hi, method=method, fprime=fprime)
+            evaluations = result["function_calls"] + result["derivative_calls"]
+            totals[method] += evaluations
+            row += f"{evaluations:>12}"
+        print(row)
+    print(f"{'mean':<16}" + "".join(f"{totals[method] / len(problems):>12.1f}" for method in ROOT_METHODS))
+
+    targets = [i * 0.731 + 0.5 for i in range(10_000)]
+    for method in ROOT_METHODS:
+        start = time.perf_counter()
+        for target in targets:
+            square_root(target, method=method)
+        elapsed = time.perf_counter() - start
+        print(f"{method}: {elapsed * 1e6 / len(targets):.1f} µs per square root")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+    else:
+        square_root_bisection(int(input("Enter the number: ")))
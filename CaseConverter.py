@@ -1,3 +1,80 @@
+from functools import lru_cache
+import re
+import sys
+
+# One word per match: an acronym that is not followed by a lowercase letter
+# (so "HTTPServer" splits into "HTTP" and "Server"), a capitalised or
+# lowercase word, or a run of digits. Digits stay attached to the word before.
+# ASCII only; other identifiers go through RUN_PATTERN and _split_letters,
+# which split the same way.
+WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])\d*|[A-Z]?[a-z]+\d*|\d+")
+# Runs of letters (in any script) or of digits; "_" and other separators
+# are dropped. Each letter run is then split at case changes.
+RUN_PATTERN = re.compile(r"[^\W\d_]+|\d+")
+CACHE_SIZE = 1 << 16
+
+def _split_letters(run):
+    # A new word starts at an uppercase letter after a lowercase one, or at
+    # the last capital of an acronym followed by lowercase ("HTTPServer"
+    # splits into "HTTP" and "Server"). Letters without case count as
+    # lowercase.
+    words = []
+    start = 0
+    for index in range(1, len(run)):
+        if run[index].isupper() and (not run[index - 1].isupper()
+                                     or index + 1 < len(run) and not run[index + 1].isupper()):
+            words.append(run[start:index])
+            start = index
+    words.append(run[start:])
+    return words
+
+def split_words(identifier):
+    if identifier.isascii():
+        return WORD_PATTERN.findall(identifier)
+    # Digits stay attached to the word right before them.
+    words = []
+    end = -1
+    for match in RUN_PATTERN.finditer(identifier):
+        run = match.group()
+        if run.isdigit():
+            if words and match.start() == end:
+                words[-1] += run
+            else:
+                words.append(run)
+        else:
+            words.extend(_split_letters(run))
+        end = match.end()
+    return words
+
+@lru_cache(maxsize=CACHE_SIZE)
+def to_snake_case(identifier):
+    return "_".join(split_words(identifier)).lower()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def to_kebab_case(identifier):
+    return "-".join(split_words(identifier)).lower()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def to_constant_case(identifier):
+    return "_".join(split_words(identifier)).upper()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def to_pascal_case(identifier):
+    return "".join(word.capitalize() for word in split_words(identifier))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def to_camel_case(identifier):
+    pascal = to_pascal_case(identifier)
+    return pascal[:1].lower() + pascal[1:]
+
+CONVERTERS = {
+    "snake": to_snake_case,
+    "kebab": to_kebab_case,
+    "constant": to_constant_case,
+    "pascal": to_pascal_case,
+    "camel": to_camel_case,
+}
+
 def convert_to_snake_case(pascal_or_camel_cased_string):
     # snake_cased_char_list = []
     # for char in pascal_or_camel_cased_string:
@@ -9,13 +86,57 @@ def convert_to_snake_case(pascal_or_camel_cased_string):
     #     snake_cased_string = ''.join(snake_cased_char_list)
     #     clean_snake_cased_string = snake_cased_string.strip('_')
     # return clean_snake_cased_string
-    snake_cased_char_list = [
-        "_" + char.lower() if char.isupper() 
-        else char
-        for char in pascal_or_camel_cased_string
-        ]
-    return  "".join(snake_cased_char_list).strip("_")
+    return to_snake_case(pascal_or_camel_cased_string)
+
+def convert_stream(identifiers, style="snake"):
+    # Lazily converts an iterable of identifiers, one per item (trailing
+    # newlines are ignored), so files of any size are handled line by line.
+    convert = CONVERTERS[style]
+    for identifier in identifiers:
+        yield convert(identifier.rstrip("\r\n"))
+
+def convert_file(input_file, output_file, style="snake"):
+    for converted in convert_stream(input_file, style):
+        output_file.write(converted + "\n")
+
+def benchmark(number_of_identifiers=1_000_000, distinct=20_000):
+    import io
+    import random
+    import time
+
+    parts = ["get", "set", "HTTP", "Server", "user", "Id", "URL", "parse", "Json", "value", "2", "Node"]
+    names = ["".join(random.choices(parts, k=random.randint(1, 4))) for _ in range(distinct)]
+    identifiers = [random.choice(names) for _ in range(number_of_identifiers)]
+
+    def per_character(string):
+        return "".join(["_" + char.lower() if char.isupper() else char for char in string]).strip("_")
+
+    start = time.perf_counter()
+    for identifier in identifiers:
+        per_character(identifier)
+    elapsed = time.perf_counter() - start
+    print(f"per-character: {number_of_identifiers / elapsed:,.0f} identifiers/s")
+
+    for style, convert in CONVERTERS.items():
+        convert.cache_clear()
+        start = time.perf_counter()
+        for _ in convert_stream(identifiers, style):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"convert_stream({style!r}): {number_of_identifiers / elapsed:,.0f} identifiers/s, {convert.cache_info()}")
+
+    source = io.StringIO("\n".join(identifiers) + "\n")
+    target = io.StringIO()
+    start = time.perf_counter()
+    convert_file(source, target)
+    elapsed = time.perf_counter() - start
+    print(f"convert_file: {number_of_identifiers / elapsed:,.0f} lines/s")
 
 def main():
     print(convert_to_snake_case(str(input("plz enter your string: "))))
-main()
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
+from fractions import Fraction
 import re
 import math
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # only QuadraticBatch needs NumPy
+    np = None
 
 class Equation(ABC):
     degree: int
@@ -114,13 +121,334 @@ class QuadraticEquation(Equation):
         
         return {"x": x, "y": y, "concavity": concavity, "min_max": min_max}
     
-def solver(equation):
-    if not isinstance(equation, Equation):
-        raise TypeError("Argument must be an instance of 'Equation' or its subclasses")
-    
-    output_string = f'\n{equation.type:-^24}'
-    output_string += f'\n\n{equation!s:^24}\n\n'
-    output_string += f'{"Solutions":-^24}\n\n'
+def _evaluate(coefficients, x):
+    # Horner's rule; coefficients run from the highest degree down.
+    # Returns the value and the first derivative at x.
+    value = derivative = 0
+    for coef in coefficients:
+        derivative = derivative * x + value
+        value = value * x + coef
+    return value, derivative
+
+def _polish(coefficients, x, steps=8):
+    # Newton steps on the original polynomial clean up the
+    # rounding error left by the closed-form expressions. Near a multiple
+    # root the derivative is almost zero and the value is mostly rounding
+    # noise, so polishing stops once the value is within the rounding error
+    # of evaluating the polynomial, and a step is only taken if it makes
+    # the value smaller.
+    value, derivative = _evaluate(coefficients, x)
+    for _ in range(steps):
+        noise = 4 * sys.float_info.epsilon * sum(abs(coef) * abs(x)**k for k, coef in enumerate(reversed(coefficients)))
+        if abs(value) <= noise or not derivative:
+            break
+        candidate = x - value / derivative
+        candidate_value, candidate_derivative = _evaluate(coefficients, candidate)
+        if abs(candidate_value) >= abs(value):
+            break
+        x, value, derivative = candidate, candidate_value, candidate_derivative
+    return x
+
+def _residual(coefficients, x):
+    # |p(x)| relative to the size of the terms it adds up, i.e. the relative
+    # change in the coefficients that would make x an exact root
+    value = _evaluate(coefficients, x)[0]
+    size = sum(abs(coef) * abs(x)**k for k, coef in enumerate(reversed(coefficients)))
+    return abs(value) / size if size else 0.0
+
+def _verified_roots(coefficients, candidates, tolerance=1e-12):
+    # Polished candidates that really are roots, sorted. Neighbours with
+    # the polynomial also within rounding of zero halfway between them
+    # cannot be told apart from one multiple root at this precision, so
+    # only the most accurate of them is kept.
+    roots = sorted(x for x in (_polish(coefficients, x) for x in candidates) if _residual(coefficients, x) <= tolerance)
+    groups = []
+    for x in roots:
+        if groups and _residual(coefficients, (groups[-1][-1] + x) / 2) <= tolerance:
+            groups[-1].append(x)
+        else:
+            groups.append([x])
+    return [min(group, key=lambda x: _residual(coefficients, x)) for group in groups]
+
+def _unique_sorted(roots, tolerance=1e-9):
+    unique = []
+    for root in sorted(roots):
+        if not unique or abs(root - unique[-1]) > tolerance * max(1, abs(root)):
+            unique.append(root)
+    return unique
+
+def _real_quadratic_roots(a, b, c):
+    # Stable real roots of a*x^2 + b*x + c = 0; a slightly negative delta
+    # left over from rounding counts as a double root.
+    delta = b**2 - 4*a*c
+    if abs(delta) <= 1e-8 * max(b**2, abs(4*a*c)):
+        # cancellation: recompute exactly from the float coefficients
+        delta = float(Fraction(b)**2 - 4 * Fraction(a) * Fraction(c))
+    if delta < 0:
+        if delta < -1e-12 * max(b**2, abs(4*a*c)):
+            return []
+        delta = 0
+    q = -(b + math.copysign(math.sqrt(delta), b)) / 2
+    if q == 0:
+        return [0.0]
+    return [q / a, c / q]
+
+def _critical_points(equation, derivative):
+    coefficients = list(equation.coefficients.values())
+    real_roots = _unique_sorted(x for x in derivative.solve() if not isinstance(x, complex))
+    return [(x, _evaluate(coefficients, x)[0]) for x in real_roots]
+
+def _cubic_discriminant_terms(a, b, c, d):
+    return (18 * a * b * c * d, -4 * b**3 * d, b**2 * c**2, -4 * a * c**3, -27 * a**2 * d**2)
+
+def _deflate(coefficients, root):
+    # Synthetic division by (x - root), dropping the remainder. It runs from
+    # the leading coefficient for a root smaller than the typical root
+    # (|a0 / an|^(1/n)) and from the constant term for a larger one, the
+    # direction that keeps the rounding error small.
+    n = len(coefficients) - 1
+    if abs(root)**n <= abs(coefficients[-1] / coefficients[0]):
+        quotient = [coefficients[0]]
+        for coef in coefficients[1:-1]:
+            quotient.append(coef + quotient[-1] * root)
+        return quotient
+    quotient = [-coefficients[-1] / root]
+    for coef in reversed(coefficients[1:-1]):
+        quotient.append((quotient[-1] - coef) / root)
+    return quotient[::-1]
+
+class CubicEquation(Equation):
+    degree = 3
+    type = "Cubic Equation"
+
+    def solve(self):
+        coefficients = list(self.coefficients.values())
+        a, b, c, d = coefficients
+        if d == 0:
+            # x = 0 exactly; the residual test cannot judge a root at 0
+            return _verified_roots(coefficients, [0.0] + _real_quadratic_roots(a, b, c))
+        A, B, C = b / a, c / a, d / a
+        # depressed cubic t^3 + p*t + q = 0 with x = t - A/3
+        p = B - A**2 / 3
+        q = 2 * A**3 / 27 - A * B / 3 + C
+        # The sign of the discriminant decides how many real roots there are;
+        # when its terms nearly cancel it is recomputed exactly from the
+        # coefficients, and anything within rounding of zero is a double (or
+        # triple) root.
+        terms = _cubic_discriminant_terms(a, b, c, d)
+        if abs(sum(terms)) <= 1e-8 * max(map(abs, terms)):
+            terms = _cubic_discriminant_terms(*map(Fraction, coefficients))
+        discriminant = -float(sum(terms)) / (108 * a**4)
+        if abs(sum(terms)) <= 1e-12 * max(map(abs, terms)):
+            # Cardano would only find the simple root
+            roots = [0.0] + ([3 * q / p, -3 * q / (2 * p)] if p else [])
+        elif discriminant > 0:
+            sqrt_discriminant = math.sqrt(discriminant)
+            roots = [math.cbrt(-q / 2 + sqrt_discriminant) + math.cbrt(-q / 2 - sqrt_discriminant)]
+        else:
+            # three real roots: trigonometric form avoids complex cube roots
+            radius = 2 * math.sqrt(-p / 3)
+            angle = math.acos(max(-1.0, min(1.0, 3 * q / (p * radius))))
+            roots = [radius * math.cos((angle - 2 * math.pi * k) / 3) for k in range(3)]
+        candidates = [t - A / 3 for t in roots]
+        # a cubic always has a real root, even if rounding spoilt all of them
+        return _verified_roots(coefficients, candidates) or [min(
+            (_polish(coefficients, x) for x in candidates), key=lambda x: _residual(coefficients, x))]
+
+    def analyze(self):
+        a, b, c, _ = self.coefficients.values()
+        return {"critical_points": _critical_points(self, PolynomialEquation(3 * a, 2 * b, c))}
+
+class QuarticEquation(Equation):
+    degree = 4
+    type = "Quartic Equation"
+
+    def solve(self):
+        coefficients = list(self.coefficients.values())
+        a, b, c, d, e = coefficients
+        if e == 0:
+            # x = 0 exactly; the residual test cannot judge a root at 0
+            return _verified_roots(coefficients, [0.0] + CubicEquation(a, b, c, d).solve())
+        A, B, C, D = b / a, c / a, d / a, e / a
+        # depressed quartic y^4 + p*y^2 + q*y + r = 0 with x = y - A/4
+        p = B - 3 * A**2 / 8
+        q = C - A * B / 2 + A**3 / 8
+        r = D - A * C / 4 + A**2 * B / 16 - 3 * A**4 / 256
+        # measure y in units of the size of the roots so that the tests
+        # below are relative to the coefficients
+        scale = max(abs(p)**(1 / 2), abs(q)**(1 / 3), abs(r)**(1 / 4))
+        if scale == 0:
+            return _verified_roots(coefficients, [-A / 4])
+        p, q, r = p / scale**2, q / scale**3, r / scale**4
+        if abs(q) <= 1e-14:
+            # biquadratic: solve for z = y^2
+            # z just below zero may be rounding around a double root at 0
+            roots = []
+            vertices = []
+            for z in _real_quadratic_roots(1, p, r):
+                if z >= 0:
+                    roots += [math.sqrt(z), -math.sqrt(z)]
+                else:
+                    vertices.append(0.0)
+        else:
+            # Ferrari: the largest root m of the resolvent cubic is positive
+            # and splits the quartic into (y^2 + s*y + u1)(y^2 - s*y + u2)
+            # with s^2 = 2m, u1 + u2 = p + 2m, u1*u2 = r and s*(u2 - u1) = q.
+            m = max(0.0, max(CubicEquation(1.0, p, p**2 / 4 - r, -q**2 / 8).solve()))
+            s = math.sqrt(2 * m)
+            if s > 1e-4:
+                u1 = p / 2 + m - q / (2 * s)
+                u2 = p / 2 + m + q / (2 * s)
+            else:
+                # q / s would divide rounding noise by rounding noise
+                u = _real_quadratic_roots(1, -(p + 2 * m), r) or [p / 2 + m]
+                u1, u2 = (min(u), max(u)) if q > 0 else (max(u), min(u))
+            # a pair that is complex only through rounding in s and u is a
+            # double root at the vertex; verification rejects the vertex of
+            # a truly complex pair
+            roots = []
+            vertices = []
+            for b, c in ((s, u1), (-s, u2)):
+                factor_roots = _real_quadratic_roots(1, b, c)
+                roots += factor_roots
+                if not factor_roots:
+                    vertices.append(-b / 2)
+        candidates = [y * scale - A / 4 for y in roots]
+        roots = _verified_roots(coefficients, candidates + [y * scale - A / 4 for y in vertices])
+        if roots and any(_residual(coefficients, _polish(coefficients, x)) > 1e-12 for x in candidates):
+            # Ferrari loses accuracy when the resolvent has nearly repeated
+            # roots (quartic roots of very different sizes); the roots it
+            # got wrong are found again from the cubic left after dividing
+            # out the most accurate one
+            best = min(roots, key=lambda x: _residual(coefficients, x))
+            roots = _verified_roots(coefficients, roots + CubicEquation(*_deflate(coefficients, best)).solve())
+        return roots
+
+    def analyze(self):
+        a, b, c, d, _ = self.coefficients.values()
+        return {"critical_points": _critical_points(self, CubicEquation(4 * a, 3 * b, 2 * c, d))}
+
+class PolynomialEquation(Equation):
+    # Any degree >= 1, taken from the number of coefficients. solve() returns
+    # every root: real ones as floats, the rest as complex numbers.
+    degree = None
+    type = "Polynomial Equation"
+
+    def __init__(self, *args, method=None):
+        if len(args) < 2:
+            raise TypeError(f"'{self.__class__.__name__}' object takes at least 2 positional arguments but {len(args)} were given")
+        self.degree = len(args) - 1
+        super().__init__(*args)
+        if method is None:
+            method = "companion" if np is not None else "aberth"
+        if method not in ("companion", "aberth"):
+            raise ValueError(f"Unknown method {method!r}, expected 'companion' or 'aberth'")
+        self.method = method
+
+    def solve(self):
+        coefficients = list(self.coefficients.values())
+        if self.method == "companion":
+            # eigenvalues of the companion matrix (what numpy.roots does)
+            roots = [complex(root) for root in np.roots(coefficients)]
+        else:
+            roots = _aberth(coefficients)
+        return sorted(
+            (root.real if abs(root.imag) <= 1e-10 * max(1, abs(root)) else root for root in roots),
+            key=lambda root: (root.real, root.imag),
+        )
+
+    def analyze(self):
+        coefficients = list(self.coefficients.values())
+        if self.degree == 1:
+            return {"critical_points": []}
+        derivative = [coef * (self.degree - i) for i, coef in enumerate(coefficients[:-1])]
+        return {"critical_points": _critical_points(self, PolynomialEquation(*derivative, method=self.method))}
+
+def _aberth(coefficients, tolerance=1e-14, max_iterations=500):
+    # Aberth-Ehrlich simultaneous iteration. Starts from points spread on a
+    # circle around the centroid of the roots and converges cubically.
+    n = len(coefficients) - 1
+    leading = coefficients[0]
+    monic = [coef / leading for coef in coefficients]
+    centre = -monic[1] / n
+    radius = max(abs(coef)**(1 / k) for k, coef in enumerate(monic[1:], 1)) or 1.0
+    roots = [centre + radius * complex(math.cos(angle), math.sin(angle))
+             for angle in (2 * math.pi * k / n + 0.4 for k in range(n))]
+    for _ in range(max_iterations):
+        largest_step = 0.0
+        for k in range(n):
+            z = roots[k]
+            value, derivative = _evaluate(monic, z)
+            if value == 0:
+                continue
+            ratio = value / derivative if derivative else value
+            repulsion = sum(1 / (z - other) for j, other in enumerate(roots) if j != k and z != other)
+            step = ratio / (1 - ratio * repulsion)
+            roots[k] = z - step
+            largest_step = max(largest_step, abs(step) / max(1, abs(z)))
+        if largest_step < tolerance:
+            break
+    return roots
+
+class QuadraticBatch:
+    # Many quadratics a*x^2 + b*x + c = 0 stored as coefficient arrays and
+    # solved together. Results are NumPy structured arrays with one row per
+    # equation instead of lists of dicts.
+    ROOTS_DTYPE = [("count", "i1"), ("x1", "f8"), ("x2", "f8")]
+    DETAILS_DTYPE = [("x", "f8"), ("y", "f8"), ("concavity", "U8"), ("min_max", "U3")]
+
+    def __init__(self, a, b, c):
+        if np is None:
+            raise ImportError("QuadraticBatch requires NumPy")
+        a, b, c = np.broadcast_arrays(*(np.asarray(coef, dtype=float) for coef in (a, b, c)))
+        if np.any(a == 0):
+            raise ValueError("Highest degree coefficient must be different from zero")
+        self.a, self.b, self.c = a, b, c
+        self.delta = b**2 - 4*a*c
+
+    def __len__(self):
+        return self.a.size
+
+    def solve(self):
+        # Same root order as QuadraticEquation.solve: x1 uses +sqrt(delta),
+        # x2 uses -sqrt(delta). The root of larger magnitude comes from
+        # q = -(b + sign(b)*sqrt(delta)) / 2 and the other from c / q, which
+        # avoids cancellation when b^2 is much larger than 4ac.
+        a, b, c, delta = self.a, self.b, self.c, self.delta
+        roots = np.zeros(a.shape, dtype=self.ROOTS_DTYPE)
+        real = delta >= 0
+        sqrt_delta = np.sqrt(np.where(real, delta, 0))
+        positive_b = b >= 0
+        q = -(b + np.where(positive_b, sqrt_delta, -sqrt_delta)) / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            large = q / a
+            small = np.where(q != 0, c / q, 0.0)
+        x1 = np.where(positive_b, small, large)
+        x2 = np.where(positive_b, large, small)
+
+        single = delta == 0
+        roots["count"] = np.where(real, np.where(single, 1, 2), 0)
+        roots["x1"] = np.where(real, np.where(single, -b / (2 * a), x1), np.nan)
+        roots["x2"] = np.where(real & ~single, x2, np.nan)
+        return roots
+
+    def analyze(self):
+        a, b, c = self.a, self.b, self.c
+        details = np.zeros(a.shape, dtype=self.DETAILS_DTYPE)
+        x = -b / (2 * a)
+        details["x"] = x
+        details["y"] = a * x**2 + b * x + c
+        upward = a > 0
+        details["concavity"] = np.where(upward, "upward", "downward")
+        details["min_max"] = np.where(upward, "min", "max")
+        return details
+
+def _report_parts(equation):
+    # Yields the pieces of the solver() report so callers can join them once
+    # or write them straight to a stream.
+    yield f'\n{equation.type:-^24}'
+    yield f'\n\n{equation!s:^24}\n\n'
+    yield f'{"Solutions":-^24}\n\n'
 
     results = equation.solve()
     match results:
@@ -130,10 +458,12 @@ def solver(equation):
             result_list = [f"x = {x:+.3f}"]  # <-- .3f for 3 decimal digits
         case [x1, x2]:
             result_list = [f"x1 = {x1:+.3f}", f"x2 = {x2:+.3f}"]  # <-- .3f for 3 decimal digits        
+        case [*roots]:
+            result_list = [f"x{i} = {x:+.3f}" for i, x in enumerate(roots, 1)]
     for result in result_list:
-        output_string += f"{result:^24}\n"
+        yield f"{result:^24}\n"
         
-    output_string += f'\n{"Details":-^24}\n\n'
+    yield f'\n{"Details":-^24}\n\n'
     
     details = equation.analyze()
     match details:
@@ -142,10 +472,90 @@ def solver(equation):
         case {'x': x, 'y': y, 'min_max': min_max, 'concavity': concavity}:
             coord = f'({x:.3f}, {y:.3f})'
             details_list = [f'concavity = {concavity:>12}', f'{min_max} = {coord:>18}']
+        case {'critical_points': []}:
+            details_list = ['no critical points']
+        case {'critical_points': points}:
+            details_list = [f'critical = {f"({x:.3f}, {y:.3f})":>13}' for x, y in points]
     for detail in details_list:
-        output_string += f'{detail}\n'    
+        yield f'{detail}\n'
 
-    return output_string
+def solver(equation):
+    if not isinstance(equation, Equation):
+        raise TypeError("Argument must be an instance of 'Equation' or its subclasses")
+    return "".join(_report_parts(equation))
+
+# Text equations such as "3x^2 - 2.5x + 1 = 0". Whitespace is removed before
+# matching; a side is one or more signed terms "c", "cx", "c*x^n" or "x^n".
+NUMBER = r"(?:\d+(?:\.\d*)?|\.\d+)(?:e[+-]?\d+)?"
+TERM = rf"(?:{NUMBER}\*?x(?:\^\d+)?|x(?:\^\d+)?|{NUMBER})"
+SIDE = rf"[+-]?{TERM}(?:[+-]{TERM})*"
+EQUATION_PATTERN = re.compile(rf"({SIDE})=({SIDE})")
+TERM_PATTERN = re.compile(rf"([+-]?)({NUMBER})?\*?(x(?:\^(\d+))?)?")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+EQUATION_TYPES = {1: LinearEquation, 2: QuadraticEquation, 3: CubicEquation, 4: QuarticEquation}
+
+def _parse_side(side, coefficients, sign):
+    for term in TERM_PATTERN.finditer(side):
+        if not term.group(0):
+            continue
+        term_sign, number, unknown, power = term.groups()
+        value = float(number) if number else 1.0
+        if term_sign == "-":
+            value = -value
+        degree = (int(power) if power else 1) if unknown else 0
+        coefficients[degree] = coefficients.get(degree, 0.0) + sign * value
+
+def parse_equation(text):
+    match = EQUATION_PATTERN.fullmatch(WHITESPACE_PATTERN.sub("", text).lower())
+    if match is None:
+        raise ValueError(f"Cannot parse equation {text.strip()!r}")
+    coefficients = {}
+    _parse_side(match.group(1), coefficients, 1)
+    _parse_side(match.group(2), coefficients, -1)
+    degree = max((n for n, coefficient in coefficients.items() if coefficient), default=0)
+    if degree == 0:
+        raise ValueError(f"Equation {text.strip()!r} has no unknown")
+    args = [coefficients.get(n, 0.0) for n in range(degree, -1, -1)]
+    return EQUATION_TYPES.get(degree, PolynomialEquation)(*args)
+
+def _json_number(value):
+    if isinstance(value, complex):
+        return {"real": value.real, "imag": value.imag}
+    return value
+
+def solve_stream(lines, output, output_format="report"):
+    # Parses one equation per line (blank lines and lines starting with '#'
+    # are skipped) and writes a solver() report or a JSON line for each.
+    # Lines that fail to parse or solve produce an error entry instead of
+    # stopping the run. Returns the number of equations solved.
+    import json
+
+    solved = 0
+    for line in lines:
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            equation = parse_equation(text)
+            if output_format == "json":
+                record = {
+                    "input": text,
+                    "type": equation.type,
+                    "equation": str(equation),
+                    "roots": [_json_number(root) for root in equation.solve()],
+                    "details": equation.analyze(),
+                }
+                output.write(json.dumps(record) + "\n")
+            else:
+                output.writelines(_report_parts(equation))
+        except (ValueError, TypeError, ArithmeticError) as error:
+            if output_format == "json":
+                output.write(json.dumps({"input": text, "error": str(error)}) + "\n")
+            else:
+                output.write(f"\nError in {text!r}: {error}\n")
+            continue
+        solved += 1
+    return solved
 
 def main():
     print("Welcome to the Equation Solver!")
@@ -183,5 +593,46 @@ def main():
             print("Invalid choice. Please select 1 or 2.")
             continue 
     
+def benchmark(degrees=(5, 10, 20, 30, 40, 50), repeats=20):
+    import random
+    import time
+
+    methods = ["aberth"] + (["companion"] if np is not None else [])
+    print(f"{'degree':>6}" + "".join(f"{method + ' ms':>16}{'residual':>12}" for method in methods))
+    for degree in degrees:
+        equations = [[random.uniform(-1, 1) or 1.0 for _ in range(degree + 1)] for _ in range(repeats)]
+        row = f"{degree:>6}"
+        for method in methods:
+            worst_residual = 0.0
+            start = time.perf_counter()
+            solutions = [PolynomialEquation(*coefficients, method=method).solve() for coefficients in equations]
+            elapsed = time.perf_counter() - start
+            for coefficients, roots in zip(equations, solutions):
+                scale = sum(abs(coef) for coef in coefficients)
+                for root in roots:
+                    value, _ = _evaluate(coefficients, root)
+                    worst_residual = max(worst_residual, abs(value) / (scale * max(1, abs(root))**degree))
+            row += f"{elapsed * 1e3 / repeats:>16.3f}{worst_residual:>12.1e}"
+        print(row)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Solve polynomial equations.")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="solve one equation per line of FILE (default: stdin) and write reports to stdout")
+    parser.add_argument("--json", action="store_true", help="with --batch, write JSON lines instead of reports")
+    parser.add_argument("--benchmark", action="store_true", help="time the polynomial root finders")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+    elif args.batch:
+        output_format = "json" if args.json else "report"
+        if args.batch == "-":
+            solve_stream(sys.stdin, sys.stdout, output_format)
+        else:
+            with open(args.batch, encoding="utf-8") as equations:
+                solve_stream(equations, sys.stdout, output_format)
+    else:
+        main()
\ No newline at end of file
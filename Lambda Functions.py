@@ -1,25 +1,519 @@
-def add_expense(expenses, amount, category):
-    expenses.append({"amount": amount, "category": category})
+from array import array
+import bisect
+from datetime import date, datetime, timedelta
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+
+# Time windows that are aggregated as expenses arrive. Each period maps a
+# local datetime to an integer bucket key and a bucket key back to a label.
+# Every period must be made of whole days (see ExpenseStore._enter_day).
+PERIODS = {
+    "daily": (lambda moment: moment.toordinal(), lambda key: date.fromordinal(key).isoformat()),
+    "monthly": (lambda moment: moment.year * 12 + moment.month - 1, lambda key: f"{key // 12:04d}-{key % 12 + 1:02d}"),
+}
+
+class Aggregate:
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self, count=0, total=0.0, minimum=math.inf, maximum=-math.inf):
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def add(self, amount):
+        self.count += 1
+        self.total += amount
+        self.minimum = min(self.minimum, amount)
+        self.maximum = max(self.maximum, amount)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def as_dict(self):
+        if not self.count:
+            return {"count": 0, "total": 0.0, "min": None, "max": None, "average": None}
+        return {"count": self.count, "total": self.total, "min": self.minimum, "max": self.maximum, "average": self.total / self.count}
+
+class ExpenseStore:
+    # Column-oriented expense storage. Amounts and timestamps live in typed
+    # arrays and categories as small integer IDs; each category keeps the rows
+    # that belong to it and a running count/total/min/max, so totals are O(1)
+    # and category filters only touch the k matching rows. Daily and monthly
+    # buckets per category are updated on every add, so reports never rescan
+    # the rows.
+    def __init__(self):
+        self.amounts = array('d')
+        self.category_ids = array('I')
+        self.timestamps = array('d')
+        self.categories = []
+        self.category_lookup = {}
+        self.rows_by_category = []
+        self.totals_by_category = array('d')
+        self.minimums_by_category = array('d')
+        self.maximums_by_category = array('d')
+        self.total = 0.0
+        self.windows = {period: {} for period in PERIODS}
+        self._day_start = self._day_end = 0.0
+        self._current_buckets = []
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def _category_id(self, category):
+        category_id = self.category_lookup.get(category)
+        if category_id is None:
+            category_id = len(self.categories)
+            self.category_lookup[category] = category_id
+            self.categories.append(category)
+            self.rows_by_category.append(array('Q'))
+            self.totals_by_category.append(0.0)
+            self.minimums_by_category.append(math.inf)
+            self.maximums_by_category.append(-math.inf)
+        return category_id
+
+    def add(self, amount, category, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        self._append(amount, self._category_id(category), timestamp)
+
+    def _append(self, amount, category_id, timestamp):
+        self.rows_by_category[category_id].append(len(self.amounts))
+        self.amounts.append(amount)
+        self.category_ids.append(category_id)
+        self.timestamps.append(timestamp)
+        self.totals_by_category[category_id] += amount
+        self.minimums_by_category[category_id] = min(self.minimums_by_category[category_id], amount)
+        self.maximums_by_category[category_id] = max(self.maximums_by_category[category_id], amount)
+        self.total += amount
+        if not self._day_start <= timestamp < self._day_end:
+            self._enter_day(timestamp)
+        for bucket in self._current_buckets:
+            aggregate = bucket.get(category_id)
+            if aggregate is None:
+                aggregate = bucket[category_id] = Aggregate()
+            aggregate.add(amount)
+
+    def _extend(self, amounts, category_ids, timestamps):
+        # Bulk _append for rows whose timestamps are in order (a journal
+        # tail). The columns grow in one go; each category's rows are then
+        # split into days with bisect, so the aggregates are updated once per
+        # category and day instead of once per row.
+        first = len(self.amounts)
+        self.amounts.extend(amounts)
+        self.category_ids.extend(category_ids)
+        self.timestamps.extend(timestamps)
+        end = len(self.amounts)
+        rows_by_category = [[] for _ in self.categories]
+        append = [rows.append for rows in rows_by_category]
+        for row, category_id in zip(range(first, end), category_ids):
+            append[category_id](row)
+
+        # first row of every day, with that day's buckets
+        day_starts = []
+        day_buckets = []
+        row = first
+        while row < end:
+            self._enter_day(self.timestamps[row])
+            day_starts.append(row)
+            day_buckets.append(self._current_buckets)
+            row = bisect.bisect_left(self.timestamps, self._day_end, row, end)
+        day_starts.append(end)
+
+        amount = self.amounts.__getitem__
+        for category_id, rows in enumerate(rows_by_category):
+            if not rows:
+                continue
+            self.rows_by_category[category_id].extend(rows)
+            start = 0
+            for next_day, buckets in zip(day_starts[1:], day_buckets):
+                stop = bisect.bisect_left(rows, next_day, start)
+                if stop == start:
+                    continue
+                day_amounts = list(map(amount, rows[start:stop]))
+                total = sum(day_amounts)
+                minimum = min(day_amounts)
+                maximum = max(day_amounts)
+                self.totals_by_category[category_id] += total
+                self.minimums_by_category[category_id] = min(self.minimums_by_category[category_id], minimum)
+                self.maximums_by_category[category_id] = max(self.maximums_by_category[category_id], maximum)
+                self.total += total
+                for bucket in buckets:
+                    aggregate = bucket.get(category_id)
+                    if aggregate is None:
+                        aggregate = bucket[category_id] = Aggregate()
+                    aggregate.merge(Aggregate(stop - start, total, minimum, maximum))
+                start = stop
+
+    def _enter_day(self, timestamp):
+        # Expenses mostly arrive in time order, so the buckets of the current
+        # day are kept at hand and only looked up again when a timestamp
+        # falls outside that day.
+        moment = datetime.fromtimestamp(timestamp)
+        midnight = datetime(moment.year, moment.month, moment.day)
+        self._day_start = midnight.timestamp()
+        self._day_end = (midnight + timedelta(days=1)).timestamp()
+        self._current_buckets = [
+            self.windows[period].setdefault(bucket_key(midnight), {})
+            for period, (bucket_key, _) in PERIODS.items()
+        ]
+
+    def category_total(self, category):
+        category_id = self.category_lookup.get(category)
+        return 0.0 if category_id is None else self.totals_by_category[category_id]
+
+    def category_aggregate(self, category_id):
+        return Aggregate(
+            len(self.rows_by_category[category_id]),
+            self.totals_by_category[category_id],
+            self.minimums_by_category[category_id],
+            self.maximums_by_category[category_id],
+        )
+
+    def summary_by_category(self):
+        return {category: self.category_aggregate(category_id).as_dict() for category_id, category in enumerate(self.categories)}
+
+    def summary_by_period(self, period, category=None):
+        # {label: aggregate} for every daily or monthly bucket, oldest first
+        _, label = PERIODS[period]
+        category_id = self.category_lookup.get(category) if category is not None else None
+        if category is not None and category_id is None:
+            return {}
+        summary = {}
+        for key in sorted(self.windows[period]):
+            bucket = self.windows[period][key]
+            if category_id is None:
+                aggregate = Aggregate()
+                for category_aggregate in bucket.values():
+                    aggregate.merge(category_aggregate)
+            elif category_id in bucket:
+                aggregate = bucket[category_id]
+            else:
+                continue
+            summary[label(key)] = aggregate.as_dict()
+        return summary
+
+    def rolling(self, period, count, now=None, category=None):
+        # aggregate over the last `count` daily or monthly buckets up to `now`
+        bucket_key, _ = PERIODS[period]
+        last = bucket_key(datetime.fromtimestamp(time.time() if now is None else now))
+        category_id = self.category_lookup.get(category) if category is not None else None
+        aggregate = Aggregate()
+        if category is not None and category_id is None:
+            return aggregate.as_dict()
+        for key in range(last - count + 1, last + 1):
+            bucket = self.windows[period].get(key, {})
+            if category_id is None:
+                for category_aggregate in bucket.values():
+                    aggregate.merge(category_aggregate)
+            elif category_id in bucket:
+                aggregate.merge(bucket[category_id])
+        return aggregate.as_dict()
+
+    def expense(self, row):
+        return {"amount": self.amounts[row], "category": self.categories[self.category_ids[row]], "timestamp": self.timestamps[row]}
+
+    def __iter__(self):
+        return map(self.expense, range(len(self.amounts)))
+
+    def by_category(self, category):
+        category_id = self.category_lookup.get(category)
+        if category_id is None:
+            return iter(())
+        return map(lambda row: {"amount": self.amounts[row], "category": category, "timestamp": self.timestamps[row]}, self.rows_by_category[category_id])
+
+class PersistentExpenseStore(ExpenseStore):
+    # An ExpenseStore backed by a directory with three files:
+    #   categories.jsonl  category names, one JSON string per line, in ID order
+    #   journal.bin       header (magic, first row number) followed by one
+    #                     fixed-width (amount, category ID, timestamp) record
+    #                     per expense
+    #   snapshot.bin      every column dumped as raw arrays at compaction time,
+    #                     followed by the daily/monthly aggregate buckets
+    # Loading copies the snapshot columns straight out of an mmap and only
+    # unpacks the journal records written after it. Files use the machine's
+    # native byte order.
+    SNAPSHOT_HEADER = struct.Struct("=8sQQdQ")
+    JOURNAL_HEADER = struct.Struct("=8sQ")
+    RECORD = struct.Struct("=dId")
+    WINDOW = struct.Struct("=BqIQddd")
+    SNAPSHOT_MAGIC = b"EXPSNAP2"
+    JOURNAL_MAGIC = b"EXPJRNL2"
+
+    def __init__(self, directory, snapshot_every=500_000, fsync=False):
+        super().__init__()
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self.categories_path = os.path.join(directory, "categories.jsonl")
+        self.journal_path = os.path.join(directory, "journal.bin")
+        self.snapshot_path = os.path.join(directory, "snapshot.bin")
+        self._load_categories()
+        self._load_snapshot()
+        self._load_journal()
+        self.categories_file = open(self.categories_path, "a", encoding="utf-8")
+
+    def _load_categories(self):
+        if not os.path.exists(self.categories_path):
+            return
+        with open(self.categories_path, encoding="utf-8") as categories:
+            for line in categories:
+                if line.strip():
+                    super()._category_id(json.loads(line))
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_path) or os.path.getsize(self.snapshot_path) == 0:
+            return
+        with open(self.snapshot_path, "rb") as snapshot, \
+                mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                memoryview(mapped) as view:
+            magic, rows, category_count, total, window_count = self.SNAPSHOT_HEADER.unpack_from(view)
+            if magic != self.SNAPSHOT_MAGIC:
+                raise ValueError(f"{self.snapshot_path} is not an expense snapshot")
+            if category_count > len(self.categories):
+                raise ValueError(f"{self.snapshot_path} refers to unknown categories")
+            offset = self.SNAPSHOT_HEADER.size
+
+            def read(column, count):
+                nonlocal offset
+                size = count * column.itemsize
+                column.frombytes(view[offset:offset + size])
+                offset += size
+                return column
+
+            counts = read(array('Q'), category_count)
+            self.totals_by_category[:category_count] = read(array('d'), category_count)
+            self.minimums_by_category[:category_count] = read(array('d'), category_count)
+            self.maximums_by_category[:category_count] = read(array('d'), category_count)
+            read(self.amounts, rows)
+            read(self.category_ids, rows)
+            read(self.timestamps, rows)
+            for category_id, count in enumerate(counts):
+                read(self.rows_by_category[category_id], count)
+            self.total = total
+
+            periods = list(PERIODS)
+            end = offset + window_count * self.WINDOW.size
+            for period_index, key, category_id, *aggregate in self.WINDOW.iter_unpack(view[offset:end]):
+                self.windows[periods[period_index]].setdefault(key, {})[category_id] = Aggregate(*aggregate)
+
+    def _load_journal(self):
+        rows = len(self.amounts)
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) >= self.JOURNAL_HEADER.size:
+            with open(self.journal_path, "r+b") as journal:
+                magic, first_row = self.JOURNAL_HEADER.unpack(journal.read(self.JOURNAL_HEADER.size))
+                if magic != self.JOURNAL_MAGIC:
+                    raise ValueError(f"{self.journal_path} is not an expense journal")
+                if first_row > rows:
+                    raise ValueError(f"{self.journal_path} starts after the end of the snapshot")
+                records = (os.path.getsize(self.journal_path) - self.JOURNAL_HEADER.size) // self.RECORD.size
+                end = self.JOURNAL_HEADER.size + records * self.RECORD.size
+                # drop a record torn by a crash halfway through a write
+                journal.truncate(end)
+                # the part of the journal already covered by the snapshot is skipped
+                start = self.JOURNAL_HEADER.size + (rows - first_row) * self.RECORD.size
+                if start < end:
+                    journal.seek(start)
+                    self._load_records(journal.read(end - start))
+            self.journal_records = records - (rows - first_row)
+        else:
+            self._write_journal_header(rows)
+            self.journal_records = 0
+        self.journal_file = open(self.journal_path, "ab")
+
+    def _load_records(self, data):
+        # A RECORD is five 32-bit words (amount, category ID, timestamp), so
+        # with the records viewed as words every field is a strided slice and
+        # the columns are copied out without unpacking record by record.
+        words = memoryview(data).cast('I')
+
+        def doubles(low, high):
+            halves = array('I', bytes(8 * len(low)))
+            halves[0::2] = array('I', low.tobytes())
+            halves[1::2] = array('I', high.tobytes())
+            return array('d', halves.tobytes())
+
+        amounts = doubles(words[0::5], words[1::5])
+        category_ids = array('I', words[2::5].tobytes())
+        timestamps = doubles(words[3::5], words[4::5])
+        if any(category_id >= len(self.categories) for category_id in set(category_ids)):
+            raise ValueError(f"{self.journal_path} refers to unknown categories")
+        stamps = timestamps.tolist()
+        if stamps == sorted(stamps):
+            self._extend(amounts, category_ids, timestamps)
+        else:
+            # timestamps passed to add() out of order: replay row by row
+            for row in zip(amounts, category_ids, timestamps):
+                self._append(*row)
+
+    def _write_journal_header(self, first_row):
+        temporary_path = self.journal_path + ".tmp"
+        with open(temporary_path, "wb") as journal:
+            journal.write(self.JOURNAL_HEADER.pack(self.JOURNAL_MAGIC, first_row))
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temporary_path, self.journal_path)
+
+    def _category_id(self, category):
+        known = len(self.categories)
+        category_id = super()._category_id(category)
+        if category_id == known:
+            # the name must be on disk before any journal record uses its ID
+            self.categories_file.write(json.dumps(category) + "\n")
+            self.categories_file.flush()
+            if self.fsync:
+                os.fsync(self.categories_file.fileno())
+        return category_id
+
+    def add(self, amount, category, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        category_id = self._category_id(category)
+        self.journal_file.write(self.RECORD.pack(amount, category_id, timestamp))
+        self.journal_file.flush()
+        if self.fsync:
+            os.fsync(self.journal_file.fileno())
+        self._append(amount, category_id, timestamp)
+        self.journal_records += 1
+        if self.snapshot_every and self.journal_records >= self.snapshot_every:
+            self.compact()
+
+    def compact(self):
+        # The new snapshot replaces the old one atomically, then the journal
+        # restarts at the snapshot's row count. A crash in between only
+        # leaves journal records that the loader skips as already covered.
+        temporary_path = self.snapshot_path + ".tmp"
+        with open(temporary_path, "wb") as snapshot:
+            window_count = sum(len(bucket) for buckets in self.windows.values() for bucket in buckets.values())
+            snapshot.write(self.SNAPSHOT_HEADER.pack(
+                self.SNAPSHOT_MAGIC, len(self.amounts), len(self.categories), self.total, window_count
+            ))
+            snapshot.write(array('Q', map(len, self.rows_by_category)).tobytes())
+            snapshot.write(self.totals_by_category.tobytes())
+            snapshot.write(self.minimums_by_category.tobytes())
+            snapshot.write(self.maximums_by_category.tobytes())
+            snapshot.write(self.amounts.tobytes())
+            snapshot.write(self.category_ids.tobytes())
+            snapshot.write(self.timestamps.tobytes())
+            for rows in self.rows_by_category:
+                snapshot.write(rows.tobytes())
+            for period_index, buckets in enumerate(self.windows.values()):
+                for key, bucket in buckets.items():
+                    for category_id, aggregate in bucket.items():
+                        snapshot.write(self.WINDOW.pack(
+                            period_index, key, category_id,
+                            aggregate.count, aggregate.total, aggregate.minimum, aggregate.maximum,
+                        ))
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+
+        self.journal_file.close()
+        self._write_journal_header(len(self.amounts))
+        self.journal_file = open(self.journal_path, "ab")
+        self.journal_records = 0
+
+    def close(self):
+        # a clean shutdown leaves an empty journal, so only a crash makes the
+        # next load replay a tail
+        if self.snapshot_every and self.journal_records:
+            self.compact()
+        self.journal_file.close()
+        self.categories_file.close()
+
+def add_expense(expenses, amount, category, timestamp=None):
+    expenses.add(amount, category, timestamp)
     
 def print_expenses(expenses):
     for expense in expenses:
         print(f"Amount: {expense["amount"]}, Category: {expense["category"]}")
 
 def total_expenses(expenses):
-    return sum(map(lambda expense: expense["amount"],expenses))
+    return expenses.total
 
 def filter_expenses_by_category(expenses, category):
-    return filter(lambda expense: expense["category"] == category, expenses)
+    return expenses.by_category(category)
+
+def print_summary(expenses):
+    print("\nBy category:")
+    for category, summary in expenses.summary_by_category().items():
+        # a category with no expenses (e.g. only named in categories.jsonl) has no min or max
+        low, high = ("-", "-") if summary["count"] == 0 else (f"{summary['min']:.2f}", f"{summary['max']:.2f}")
+        print(f"{category}: total {summary['total']:.2f}, count {summary['count']}, min {low}, max {high}")
+    print("\nBy month:")
+    for month, summary in expenses.summary_by_period("monthly").items():
+        print(f"{month}: total {summary['total']:.2f}, count {summary['count']}")
+    last_week = expenses.rolling("daily", 7)
+    print(f"\nLast 7 days: total {last_week['total']:.2f}, count {last_week['count']}")
+
+def benchmark(directory="expenses_benchmark", appends=1_000_000, rows=10_000_000):
+    import random
+    import shutil
+
+    shutil.rmtree(directory, ignore_errors=True)
+    categories = [f"category {i}" for i in range(50)]
+    amounts = [round(random.uniform(1, 500), 2) for _ in range(1000)]
+    # one expense every 3 seconds: 10M expenses span about a year
+    first_timestamp = 1_700_000_000
+
+    store = PersistentExpenseStore(directory, snapshot_every=0)
+    start = time.perf_counter()
+    for i in range(appends):
+        store.add(amounts[i % 1000], categories[i % 50], first_timestamp + 3 * i)
+    elapsed = time.perf_counter() - start
+    print(f"journal append: {appends / elapsed:,.0f} expenses/s")
+
+    # worst case for a reload: a crash left a journal tail one record short
+    # of the default snapshot_every (snapshot_every=0 keeps close() from
+    # compacting it here)
+    tail = 500_000 - 1
+    for i in range(appends, rows - tail):
+        store._append(amounts[i % 1000], i % 50, first_timestamp + 3 * i)
+    start = time.perf_counter()
+    store.compact()
+    elapsed = time.perf_counter() - start
+    print(f"snapshot of {len(store):,} expenses: {elapsed:.2f} s")
+
+    for i in range(rows - tail, rows):
+        store.add(amounts[i % 1000], categories[i % 50], first_timestamp + 3 * i)
+    store.close()
+
+    start = time.perf_counter()
+    reloaded = PersistentExpenseStore(directory, snapshot_every=0)
+    elapsed = time.perf_counter() - start
+    print(f"reload of {len(reloaded):,} expenses ({tail:,} from the journal tail): {elapsed:.3f} s")
+
+    start = time.perf_counter()
+    reloaded.summary_by_category()
+    reloaded.summary_by_period("monthly")
+    reloaded.rolling("daily", 30, now=first_timestamp + 3 * rows)
+    elapsed = time.perf_counter() - start
+    print(f"category, monthly and 30-day reports: {elapsed * 1e3:.2f} ms")
+    reloaded.close()
+    shutil.rmtree(directory)
+
+EXPENSES_DIRECTORY = "expenses_data"
 
 def main():
-    expenses = []
+    expenses = PersistentExpenseStore(EXPENSES_DIRECTORY)
     while True:
         print("\nExpense Tracker")
         print("1. Add an expense")
         print('2. List all expenses')
         print("3. Show total expenses")
         print("4. Filter expenses by category")
-        print("5. Exit")
+        print("5. Show summary by category and month")
+        print("6. Exit")
         
         choice = input("Enter your choice: ")
         if choice == "1":
@@ -36,7 +530,14 @@ def main():
             expenses_from_category = filter_expenses_by_category(expenses, category)
             print_expenses(expenses_from_category)   
         elif choice == "5":
+            print_summary(expenses)
+        elif choice == "6":
             print("Exiting the program.")
             break
+    expenses.close()
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
\ No newline at end of file
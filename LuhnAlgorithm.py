@@ -2,6 +2,22 @@
 #2. Take the sum of all the digits.
 #3. If the sum of all the digits is a multiple of 10, then the number is valid; else it is not valid.
 
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # only the bulk API needs NumPy
+    np = None
+
+# Precomputed Luhn contribution of every digit, indexed by [doubled][digit].
+LUHN_TABLE = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),  # digits kept as they are
+    (0, 2, 4, 6, 8, 1, 3, 5, 7, 9),  # doubled digits, with the digits of the product summed
+)
+
 def verify_card_number(card_number):
     sum_of_odd_digits = 0
     card_number_reversed = card_number[::-1]
@@ -15,15 +31,223 @@ def verify_card_number(card_number):
     even_digits = card_number_reversed[1::2]
     
     for digit in even_digits:
-        number = int(digit) *2
-        if number >= 10:
-            number = number // 10 + number % 10
-        sum_of_even_digits += number
+        sum_of_even_digits += LUHN_TABLE[1][int(digit)]
     total = sum_of_even_digits + sum_of_odd_digits
-    print(total)
+    # print(total)
     
     return 0 == total % 10
-    
+
+def compute_check_digit(partial_card_number):
+    # The digit to append to partial_card_number to make it pass the check.
+    # The last digit of the partial number ends up second from the right,
+    # so doubling starts there.
+    total = 0
+    for position, digit in enumerate(reversed(partial_card_number)):
+        total += LUHN_TABLE[position % 2 == 0][int(digit)]
+    return str(-total % 10)
+
+class LuhnValidator:
+    # Incremental validation for digits arriving left to right, e.g. from a
+    # keyboard. The final length (and so which digits get doubled) is unknown
+    # until the end, so two running totals are kept: totals[p] doubles the
+    # digits whose index from the left has parity p. A number of length n
+    # doubles the indices with parity n % 2. Each digit costs O(1) and
+    # backspace just restores the previous pair.
+    def __init__(self, digits=""):
+        self.totals = (0, 0)
+        self.history = []
+        self.feed(digits)
+
+    def __len__(self):
+        return len(self.history)
+
+    def push(self, digit):
+        value = int(digit)
+        parity = len(self.history) % 2
+        self.history.append(self.totals)
+        even, odd = self.totals
+        self.totals = (even + LUHN_TABLE[parity == 0][value], odd + LUHN_TABLE[parity == 1][value])
+
+    def pop(self):
+        self.totals = self.history.pop()
+
+    def feed(self, text):
+        # separators such as spaces and dashes are skipped
+        for character in text:
+            # ASCII digits only: str.isdigit() also accepts "²" and the like
+            if character in "0123456789":
+                self.push(character)
+
+    @property
+    def is_valid(self):
+        return bool(self.history) and self.totals[len(self.history) % 2] % 10 == 0
+
+    @property
+    def check_digit(self):
+        # the digit that would complete the digits seen so far
+        return str(-self.totals[(len(self.history) + 1) % 2] % 10)
+
+# Bulk validation. Numbers are handled as rows of a uint8 matrix: either
+# digit values (0-9) or raw ASCII bytes of fixed-width records, where any
+# byte that is not a digit (padding, spaces, dashes, newlines) is masked out.
+# Each digit's position is counted from the rightmost digit of its own row,
+# so variable lengths and left or right alignment both work.
+
+def _luhn_totals(digits, mask):
+    table = np.array(LUHN_TABLE, dtype=np.uint8)
+    # 1 for the rightmost digit of a row, 2 for the next one, ...
+    rank = np.cumsum(mask[:, ::-1], axis=1, dtype=np.int16)[:, ::-1]
+    doubled = (rank & 1 == 0) & mask
+    values = table[doubled.view(np.uint8), np.where(mask, digits, 0)]
+    return values.sum(axis=1, dtype=np.int64)
+
+def verify_digit_matrix(digits, lengths=None):
+    # digits: (numbers, width) matrix of digit values. With `lengths`, row i
+    # holds its number in the first lengths[i] columns and the rest is padding.
+    if np is None:
+        raise ImportError("verify_digit_matrix requires NumPy")
+    digits = np.asarray(digits, dtype=np.uint8)
+    if lengths is None:
+        mask = np.ones(digits.shape, dtype=bool)
+    else:
+        mask = np.arange(digits.shape[1]) < np.asarray(lengths)[:, None]
+    # a row without digits is not a valid number, as in LuhnValidator
+    return (_luhn_totals(digits, mask) % 10 == 0) & mask.any(axis=1)
+
+def verify_records(buffer, record_width):
+    # buffer: bytes-like object of fixed-width ASCII records, e.g. 16 digits
+    # plus a newline per card (record_width=17).
+    if np is None:
+        raise ImportError("verify_records requires NumPy")
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    whole = data.size - data.size % record_width
+    valid = _verify_record_matrix(data[:whole].reshape(-1, record_width))
+    if whole == data.size:
+        return valid
+    # the last record has no trailing newline: check it padded on its own
+    # rather than copying the whole buffer
+    last = np.full((1, record_width), ord("\n"), dtype=np.uint8)
+    last[0, :data.size - whole] = data[whole:]
+    return np.concatenate([valid, _verify_record_matrix(last)])
+
+def _verify_record_matrix(records):
+    digits = records - ord("0")  # wraps around for non-digit bytes
+    mask = digits < 10
+    # a record without digits is not a valid number, as in LuhnValidator
+    return (_luhn_totals(digits, mask) % 10 == 0) & mask.any(axis=1)
+
+def verify_card_numbers(card_numbers):
+    # Any sequence of strings; they are packed into one fixed-width byte matrix.
+    if np is None:
+        raise ImportError("verify_card_numbers requires NumPy")
+    packed = np.array([number.encode("ascii") for number in card_numbers])
+    if packed.size == 0:
+        return np.zeros(0, dtype=bool)
+    return verify_records(packed.tobytes(), packed.dtype.itemsize)
+
+def generate_card_numbers(prefix, count, length=16, first_account=0):
+    # `count` valid numbers of `length` digits: the prefix (e.g. a BIN),
+    # consecutive zero-padded account numbers from first_account, and the
+    # Luhn check digit, all computed on a digit matrix at once.
+    if np is None:
+        raise ImportError("generate_card_numbers requires NumPy")
+    account_width = length - len(prefix) - 1
+    if (prefix and not (prefix.isascii() and prefix.isdigit())) or account_width < 0:
+        raise ValueError("prefix must be digits and shorter than the card number")
+    if first_account + count > 10**account_width:
+        raise ValueError(f"only {10**account_width - first_account} accounts fit after prefix {prefix!r}")
+    digits = np.zeros((count, length), dtype=np.uint8)
+    digits[:, :len(prefix)] = [int(digit) for digit in prefix]
+    accounts = np.arange(first_account, first_account + count, dtype=np.int64)
+    powers = 10 ** np.arange(account_width - 1, -1, -1, dtype=np.int64)
+    digits[:, len(prefix):-1] = accounts[:, None] // powers % 10
+    # with a 0 in the check position the total only lacks the check digit
+    digits[:, -1] = -_luhn_totals(digits, np.ones(digits.shape, dtype=bool)) % 10
+    return (digits + ord("0")).view(f"S{length}").ravel().astype(str).tolist()
+
+def generate_card_numbers_for_bins(first_bin, last_bin, count_per_bin, length=16):
+    # Load-test fixtures for every BIN in [first_bin, last_bin].
+    numbers = []
+    for bin_number in range(int(first_bin), int(last_bin) + 1):
+        numbers += generate_card_numbers(str(bin_number).zfill(len(str(first_bin))), count_per_bin, length)
+    return numbers
+
+def _verify_file_chunk(path, offset, size, record_width):
+    with open(path, "rb") as card_file:
+        card_file.seek(offset)
+        return verify_records(card_file.read(size), record_width)
+
+def verify_card_file(path, record_width=None, chunk_records=1_000_000, workers=None):
+    # Yields one boolean array per chunk of fixed-width records, in file order.
+    # Every worker process reads its own byte range of the file, so only the
+    # (offset, size) pair and the packed result cross process boundaries.
+    if record_width is None:
+        with open(path, "rb") as card_file:
+            record_width = len(card_file.readline())
+    file_size = os.path.getsize(path)
+    chunk_size = chunk_records * record_width
+    chunks = [(offset, min(chunk_size, file_size - offset)) for offset in range(0, file_size, chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        for offset, size in chunks:
+            yield _verify_file_chunk(path, offset, size, record_width)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(
+            _verify_file_chunk,
+            repeat(path), (offset for offset, _ in chunks), (size for _, size in chunks), repeat(record_width),
+        )
+
+def benchmark(count=1_000_000, path="luhn_benchmark.txt"):
+    import random
+    import time
+
+    def random_card():
+        body = "".join(random.choices("0123456789", k=15))
+        for check_digit in "0123456789":
+            if verify_card_number(body + check_digit):
+                return body + check_digit if random.random() < 0.5 else body + str((int(check_digit) + 1) % 10)
+
+    base = [random_card() for _ in range(10_000)]
+    numbers = (base * (count // len(base) + 1))[:count]
+
+    start = time.perf_counter()
+    for number in numbers[:100_000]:
+        verify_card_number(number)
+    elapsed = time.perf_counter() - start
+    print(f"verify_card_number: {100_000 / elapsed:,.0f} numbers/s")
+
+    start = time.perf_counter()
+    valid = verify_card_numbers(numbers)
+    elapsed = time.perf_counter() - start
+    print(f"verify_card_numbers: {count / elapsed:,.0f} numbers/s ({valid.sum():,} valid)")
+
+    digits = np.frombuffer("".join(numbers).encode("ascii"), dtype=np.uint8).reshape(count, 16) - ord("0")
+    start = time.perf_counter()
+    verify_digit_matrix(digits)
+    elapsed = time.perf_counter() - start
+    print(f"verify_digit_matrix: {count / elapsed:,.0f} numbers/s")
+
+    records = ("\n".join(numbers) + "\n").encode("ascii")
+    start = time.perf_counter()
+    verify_records(records, 17)
+    elapsed = time.perf_counter() - start
+    print(f"verify_records: {count / elapsed:,.0f} numbers/s")
+
+    start = time.perf_counter()
+    generate_card_numbers("453957", count)
+    elapsed = time.perf_counter() - start
+    print(f"generate_card_numbers: {count / elapsed:,.0f} numbers/s")
+
+    with open(path, "wb") as card_file:
+        for _ in range(10):
+            card_file.write(records)
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        total = sum(len(chunk) for chunk in verify_card_file(path, workers=workers))
+        elapsed = time.perf_counter() - start
+        print(f"verify_card_file, {workers} worker(s): {total / elapsed:,.0f} numbers/s")
+    os.remove(path)
+
 def main():
     card_number = input(str("plz enter and your numbers"))
     card_translation = str.maketrans({'-': '', ' ': ''})
@@ -34,4 +258,8 @@ def main():
     else:
         print("INVALID!")
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
\ No newline at end of file
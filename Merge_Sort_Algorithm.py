@@ -1,6 +1,16 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import bisect
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+
 def merge_sort(array):
     if len(array) <= 1:
-        return
+        return array
     
     middle_point = len(array) // 2
     left_part = array[:middle_point]       # array = [1,2,3,4,5] and mid_point = 3 then left_part = array[:mid_point] = [1,2,3] 
@@ -34,8 +44,336 @@ def merge_sort(array):
         
     return array
         
+# Bottom-up variant: no slicing per level. The input is split into natural
+# runs (ascending, or strictly descending and reversed in place, which keeps
+# equal elements in order), short runs are extended to MIN_RUN with insertion
+# sort, and then neighbouring runs are merged pass by pass, bouncing between
+# the list and one auxiliary buffer of the same size.
+MIN_RUN = 32
+
+def _insertion_sort(keys, values, lo, start, hi):
+    # keys[lo:start] is already sorted; binary-insert keys[start:hi] one by
+    # one after any equal keys, shifting with slice assignment
+    for i in range(start, hi):
+        key = keys[i]
+        j = bisect.bisect_right(keys, key, lo, i)
+        if j == i:
+            continue
+        keys[j + 1:i + 1] = keys[j:i]
+        keys[j] = key
+        if values is not None:
+            value = values[i]
+            values[j + 1:i + 1] = values[j:i]
+            values[j] = value
+
+def _find_runs(keys, values):
+    n = len(keys)
+    boundaries = [0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n and keys[hi] < keys[lo]:
+            while hi < n and keys[hi] < keys[hi - 1]:
+                hi += 1
+            keys[lo:hi] = keys[lo:hi][::-1]
+            if values is not None:
+                values[lo:hi] = values[lo:hi][::-1]
+        else:
+            while hi < n and not keys[hi] < keys[hi - 1]:
+                hi += 1
+        if hi - lo < MIN_RUN and hi < n:
+            end = min(lo + MIN_RUN, n)
+            _insertion_sort(keys, values, lo, hi, end)
+            hi = end
+        boundaries.append(hi)
+        lo = hi
+    return boundaries
+
+def _merge(source_keys, source_values, target_keys, target_values, lo, middle, hi):
+    left, right, index = lo, middle, lo
+    if middle < hi and source_keys[middle] < source_keys[middle - 1]:
+        if source_values is None:
+            while left < middle and right < hi:
+                if source_keys[right] < source_keys[left]:
+                    target_keys[index] = source_keys[right]
+                    right += 1
+                else:
+                    target_keys[index] = source_keys[left]
+                    left += 1
+                index += 1
+        else:
+            while left < middle and right < hi:
+                if source_keys[right] < source_keys[left]:
+                    target_keys[index] = source_keys[right]
+                    target_values[index] = source_values[right]
+                    right += 1
+                else:
+                    target_keys[index] = source_keys[left]
+                    target_values[index] = source_values[left]
+                    left += 1
+                index += 1
+    # whatever is left of either run is already in order
+    for start, stop in ((left, middle), (right, hi)):
+        end = index + stop - start
+        target_keys[index:end] = source_keys[start:stop]
+        if source_values is not None:
+            target_values[index:end] = source_values[start:stop]
+        index = end
+
+def merge_sort_bottom_up(array, key=None, reverse=False):
+    # Sorts the list in place and returns it; stable, like list.sort.
+    n = len(array)
+    if n <= 1:
+        return array
+    if key is None:
+        keys, values = array, None
+    else:
+        # keys are computed once and moved together with the items
+        keys, values = [key(item) for item in array], array
+    # Like list.sort: a descending sort is an ascending sort of the reversed
+    # list, reversed back, which keeps equal elements in their original order.
+    if reverse:
+        keys.reverse()
+        if values is not None:
+            values.reverse()
+
+    boundaries = _find_runs(keys, values)
+    source_keys, source_values = keys, values
+    target_keys = [None] * n
+    target_values = [None] * n if values is not None else None
+    while len(boundaries) > 2:
+        merged = [0]
+        for i in range(0, len(boundaries) - 1, 2):
+            lo, middle = boundaries[i], boundaries[i + 1]
+            hi = boundaries[i + 2] if i + 2 < len(boundaries) else middle
+            _merge(source_keys, source_values, target_keys, target_values, lo, middle, hi)
+            merged.append(hi)
+        boundaries = merged
+        source_keys, target_keys = target_keys, source_keys
+        source_values, target_values = target_values, source_values
+
+    if source_keys is not keys:
+        keys[:] = source_keys
+        if values is not None:
+            values[:] = source_values
+    if reverse:
+        keys.reverse()
+        if values is not None:
+            values.reverse()
+    return array
+
+# External sort for inputs larger than memory. Records are text lines; the
+# input is cut into chunks that fit the memory budget, each chunk is sorted
+# with merge_sort_bottom_up and spilled to a temporary run file, and the runs
+# are k-way merged through a heap (heapq.merge) into the output. With more
+# runs than `fan_in`, groups of runs are merged into longer runs first so the
+# number of open files stays bounded.
+
+def _open(file, mode, encoding):
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, mode, encoding=encoding, newline="")
+    return None
+
+def _spill(lines, directory, encoding):
+    descriptor, path = tempfile.mkstemp(dir=directory, suffix=".run")
+    with open(descriptor, "w", encoding=encoding, newline="") as run:
+        run.writelines(lines)
+    return path
+
+def _merge_runs(paths, output, key, reverse, encoding):
+    with ExitStack() as stack:
+        runs = [stack.enter_context(open(path, encoding=encoding, newline="")) for path in paths]
+        output.writelines(heapq.merge(*runs, key=key, reverse=reverse))
+    for path in paths:
+        os.remove(path)
+
+def external_sort(input_file, output_file, key=None, parse=None, reverse=False,
+                  memory_limit=256 * 2**20, fan_in=64, temp_dir=None, encoding="utf-8"):
+    # input_file/output_file: paths or open text files. `parse` turns a line
+    # into a record and `key` maps that record to its sort key; lines are
+    # written out unchanged. memory_limit (bytes) is an estimate: chunks are
+    # cut at half of it to leave room for the keys and the merge buffer.
+    # The sort is stable. Returns the number of records and of spilled runs.
+    if parse is None and key is None:
+        line_key = None
+    elif parse is None:
+        line_key = key
+    elif key is None:
+        line_key = parse
+    else:
+        line_key = lambda line: key(parse(line))
+
+    with ExitStack() as stack:
+        opened = _open(input_file, "r", encoding)
+        source = stack.enter_context(opened) if opened else input_file
+        opened = _open(output_file, "w", encoding)
+        target = stack.enter_context(opened) if opened else output_file
+        directory = stack.enter_context(tempfile.TemporaryDirectory(dir=temp_dir, prefix="external-sort-"))
+
+        runs = []
+        chunk = []
+        chunk_size = 0
+        records = 0
+        for line in source:
+            if not line.endswith("\n"):
+                line += "\n"
+            chunk.append(line)
+            chunk_size += sys.getsizeof(line) + 8
+            records += 1
+            if chunk_size >= memory_limit // 2:
+                runs.append(_spill(merge_sort_bottom_up(chunk, key=line_key, reverse=reverse), directory, encoding))
+                chunk = []
+                chunk_size = 0
+
+        merge_sort_bottom_up(chunk, key=line_key, reverse=reverse)
+        if not runs:
+            target.writelines(chunk)
+            return {"records": records, "runs": 0}
+        if chunk:
+            runs.append(_spill(chunk, directory, encoding))
+        spilled = len(runs)
+        chunk = None
+
+        # merge consecutive groups so that ties keep their input order
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                descriptor, path = tempfile.mkstemp(dir=directory, suffix=".run")
+                with open(descriptor, "w", encoding=encoding, newline="") as run:
+                    _merge_runs(runs[i:i + fan_in], run, line_key, reverse, encoding)
+                merged.append(path)
+            runs = merged
+        _merge_runs(runs, target, line_key, reverse, encoding)
+    return {"records": records, "runs": spilled}
+
+# Parallel sort for numeric data. The numbers live in two memory-mapped
+# scratch files holding raw arrays of one typecode, so worker processes only
+# receive the file paths and index ranges, never the data itself (and no
+# shared-memory segment can leak if a worker dies). Each worker sorts one
+# chunk with merge_sort_bottom_up; the sorted chunks are then merged pairwise
+# in a tree, every level in parallel, bouncing between the two files.
+
+def _attach(path, typecode):
+    with open(path, "r+b") as scratch:
+        mapped = mmap.mmap(scratch.fileno(), 0)
+    return mapped, memoryview(mapped).cast(typecode)
+
+def _sort_chunk(path, typecode, lo, hi):
+    mapped, view = _attach(path, typecode)
+    try:
+        view[lo:hi] = array(typecode, merge_sort_bottom_up(view[lo:hi].tolist()))
+    finally:
+        view.release()
+        mapped.close()
+
+def _merge_chunks(source_path, target_path, typecode, lo, middle, hi):
+    source_mapped, source = _attach(source_path, typecode)
+    target_mapped, target = _attach(target_path, typecode)
+    try:
+        # straight from one mapping into the other, so even the last level
+        # holds no copy of the data in memory
+        _merge(source, None, target, None, lo, middle, hi)
+    finally:
+        source.release()
+        target.release()
+        source_mapped.close()
+        target_mapped.close()
+
+def parallel_merge_sort(values, workers=None, typecode=None, temp_dir=None):
+    # Returns a sorted array of `typecode` ('d' by default, or the typecode
+    # of an input array).
+    if typecode is None:
+        typecode = values.typecode if isinstance(values, array) else "d"
+    data = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    workers = workers or os.cpu_count() or 1
+    n = len(data)
+    if workers == 1 or n < 2 * workers:
+        return array(typecode, merge_sort_bottom_up(data.tolist()))
+
+    with tempfile.TemporaryDirectory(dir=temp_dir, prefix="parallel-sort-") as directory:
+        paths = [os.path.join(directory, name) for name in ("a.bin", "b.bin")]
+        with open(paths[0], "wb") as scratch:
+            data.tofile(scratch)
+        with open(paths[1], "wb") as scratch:
+            scratch.truncate(n * data.itemsize)
+
+        boundaries = [n * i // workers for i in range(workers + 1)]
+        source, target = 0, 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_sort_chunk, *zip(*(
+                (paths[0], typecode, lo, hi) for lo, hi in zip(boundaries, boundaries[1:])
+            ))))
+            while len(boundaries) > 2:
+                tasks = []
+                merged = [0]
+                for i in range(0, len(boundaries) - 1, 2):
+                    lo, middle = boundaries[i], boundaries[i + 1]
+                    # an odd chunk out is "merged" with an empty one, i.e. copied
+                    hi = boundaries[i + 2] if i + 2 < len(boundaries) else middle
+                    tasks.append((paths[source], paths[target], typecode, lo, middle, hi))
+                    merged.append(hi)
+                list(pool.map(_merge_chunks, *zip(*tasks)))
+                boundaries = merged
+                source, target = target, source
+
+        result = array(typecode)
+        with open(paths[source], "rb") as scratch:
+            result.fromfile(scratch, n)
+        return result
+
+def benchmark(n=200_000, parallel_n=2_000_000):
+    import random
+    import time
+
+    random_numbers = [random.random() for _ in range(n)]
+    inputs = {
+        "random": random_numbers,
+        "sorted": sorted(random_numbers),
+        "reversed": sorted(random_numbers, reverse=True),
+        "few runs": sum((sorted(random_numbers[i::8]) for i in range(8)), []),
+    }
+    implementations = {
+        "merge_sort": merge_sort,
+        "merge_sort_bottom_up": merge_sort_bottom_up,
+        "list.sort": list.sort,
+    }
+    print(f"{'input':<10}" + "".join(f"{name:>22}" for name in implementations))
+    for input_name, data in inputs.items():
+        row = f"{input_name:<10}"
+        for sort in implementations.values():
+            items = data[:]
+            start = time.perf_counter()
+            sort(items)
+            elapsed = time.perf_counter() - start
+            row += f"{elapsed * 1e3:>19.1f} ms"
+        print(row)
+
+    numbers = array("d", (random.random() for _ in range(parallel_n)))
+    baseline = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        start = time.perf_counter()
+        parallel_merge_sort(numbers, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"parallel_merge_sort, {parallel_n} doubles, {workers} worker(s): {elapsed:.2f} s (speedup {baseline / elapsed:.2f}x)")
+
 if __name__ == '__main__':
-    numbers = [4, 10, 6, 14, 2, 1, 8, 5]
-    print(f"Unsorted array: {numbers}")
-    
-    print(f"\nSorted array: {merge_sort(numbers)}")
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Merge sort demo, benchmark and external line sort.")
+    parser.add_argument("--benchmark", action="store_true", help="compare the in-memory merge sorts")
+    parser.add_argument("--external", nargs=2, metavar=("INPUT", "OUTPUT"), help="sort the lines of INPUT into OUTPUT")
+    parser.add_argument("--memory-mb", type=int, default=256, help="memory budget for --external (default: 256)")
+    parser.add_argument("--reverse", action="store_true", help="with --external, sort in descending order")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+    elif args.external:
+        stats = external_sort(*args.external, reverse=args.reverse, memory_limit=args.memory_mb * 2**20)
+        print(f"Sorted {stats['records']} records using {stats['runs']} runs")
+    else:
+        numbers = [4, 10, 6, 14, 2, 1, 8, 5]
+        print(f"Unsorted array: {numbers}")
+        
+        print(f"\nSorted array: {merge_sort(numbers)}")
@@ -1,4 +1,13 @@
+import functools
+import io
 import math
+import shutil
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # only the sampling and batch APIs need NumPy
+    np = None
 
 GRAVITATIONAL_ACCELERATION = 9.81
 PROJECTILE = "∙"
@@ -44,6 +53,25 @@ class Projectile:
             coordinates.append((x, y))
     
         return coordinates
+
+    def sample_trajectory(self, step=None, points=None):
+        # x and y as NumPy arrays from launch to impact, either every `step`
+        # metres (the impact point is always included) or `points` evenly
+        # spaced samples (default 200).
+        if np is None:
+            raise ImportError("sample_trajectory requires NumPy")
+        if step is not None and points is not None:
+            raise ValueError("Pass either step or points, not both")
+        displacement = self.__calculate_displacement()
+        if step is not None:
+            if step <= 0:
+                raise ValueError("step must be positive")
+            x = np.append(np.arange(0, displacement, step), displacement)
+        else:
+            x = np.linspace(0, displacement, 200 if points is None else points)
+        # __calculate_y_coordinate is plain arithmetic, so it broadcasts over x
+        y = np.maximum(self.__calculate_y_coordinate(x), 0)
+        return x, y
     
     @property
     def speed(self):
@@ -69,9 +97,503 @@ class Projectile:
     def angle(self, value):
         self.__angle = math.radians(value)
         
+    def aim(self, distance):
+        # launch angles (degrees) that hit a target `distance` metres away
+        return launch_angles(self.__speed, self.__height, distance)
+
     def __repr__(self):
         return f'Projectile({self.speed}, {self.height}, {self.angle})'
  
+def calculate_batch(speeds, heights, angles):
+    # Displacement, apex and flight time for many projectiles at once.
+    # Arguments broadcast against each other; angles are in degrees.
+    if np is None:
+        raise ImportError("calculate_batch requires NumPy")
+    g = GRAVITATIONAL_ACCELERATION
+    v, h, θ = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (speeds, heights, np.radians(angles))))
+    vx = v * np.cos(θ)
+    vy = v * np.sin(θ)
+    flight_time = (vy + np.sqrt(vy**2 + 2 * g * h)) / g
+    # shots angled downwards peak at the launch point
+    apex_time = np.maximum(vy, 0) / g
+    return {
+        "displacement": vx * flight_time,
+        "apex_x": vx * apex_time,
+        "apex_y": h + vy * apex_time - g * apex_time**2 / 2,
+        "flight_time": flight_time,
+    }
+
+@functools.lru_cache(maxsize=4096)
+def launch_angles(speed, height, distance):
+    # Launch angles in degrees, lowest first, that land a drag-free projectile
+    # exactly `distance` metres away; () when the target is out of range.
+    # With u = tan(θ) and a = g d² / 2v², the trajectory equation at x = d is
+    # a u² - d u + (a - h) = 0.
+    if speed <= 0 or distance <= 0:
+        raise ValueError("speed and distance must be positive")
+    a = GRAVITATIONAL_ACCELERATION * distance**2 / (2 * speed**2)
+    discriminant = distance**2 - 4 * a * (a - height)
+    if discriminant < 0:
+        return ()
+    root = math.sqrt(discriminant)
+    # the low root in the cancellation-free form
+    low = math.degrees(math.atan(2 * (a - height) / (distance + root)))
+    high = math.degrees(math.atan((distance + root) / (2 * a)))
+    return (low,) if discriminant == 0 else (low, high)
+
+def maximum_range(speed, height):
+    # (angle in degrees, distance) of the farthest drag-free shot
+    g = GRAVITATIONAL_ACCELERATION
+    speed_at_ground = math.sqrt(speed**2 + 2 * g * height)
+    return math.degrees(math.atan(speed / speed_at_ground)), speed * speed_at_ground / g
+
+# Integration-based engine for projectiles with air drag. The state of every
+# projectile is (x, y, vx, vy); all of them are advanced together as arrays
+# with the Dormand-Prince RK5(4) pair, each with its own adaptive step size.
+# Drag per unit mass is linear_drag * v_rel + quadratic_drag * |v_rel| * v_rel,
+# where v_rel is the velocity relative to a horizontal wind. Any parameter can
+# be a number, an array with one value per projectile, or a function of time
+# that takes and returns arrays.
+
+DORMAND_PRINCE_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+DORMAND_PRINCE_C = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1)
+# 5th order weights minus the embedded 4th order ones
+DORMAND_PRINCE_ERROR = (
+    35 / 384 - 5179 / 57600, 0, 500 / 1113 - 7571 / 16695, 125 / 192 - 393 / 640,
+    -2187 / 6784 + 92097 / 339200, 11 / 84 - 187 / 2100, -1 / 40,
+)
+
+def _parameter(value, t, index):
+    if callable(value):
+        return value(t)
+    value = np.asarray(value, dtype=float)
+    return value if value.ndim == 0 else value[index]
+
+def _derivatives(t, state, index, linear_drag, quadratic_drag, wind):
+    _, _, vx, vy = state
+    relative_vx = vx - _parameter(wind, t, index)
+    drag = _parameter(linear_drag, t, index) + _parameter(quadratic_drag, t, index) * np.hypot(relative_vx, vy)
+    return np.array([vx, vy, -drag * relative_vx, -GRAVITATIONAL_ACCELERATION - drag * vy])
+
+def _dormand_prince_step(f, t, state, h, k1):
+    # returns the 5th order state, the derivative there (reused as the next
+    # k1) and the local error estimate
+    k = [k1]
+    for stage in range(1, 7):
+        increment = sum(a * k_j for a, k_j in zip(DORMAND_PRINCE_A[stage], k) if a)
+        k.append(f(t + DORMAND_PRINCE_C[stage] * h, state + h * increment))
+    new_state = state + h * sum(b * k_j for b, k_j in zip(DORMAND_PRINCE_A[6], k) if b)
+    error = h * sum(e * k_j for e, k_j in zip(DORMAND_PRINCE_ERROR, k) if e)
+    return new_state, k[6], error
+
+def _rk4_step(f, t, state, h, k1):
+    k2 = f(t + h / 2, state + h / 2 * k1)
+    k3 = f(t + h / 2, state + h / 2 * k2)
+    k4 = f(t + h, state + h * k3)
+    new_state = state + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    return new_state, f(t + h, new_state)
+
+def _hermite(y0, dy0, y1, dy1, h, theta):
+    # cubic Hermite interpolation at fraction theta of a step of length h
+    theta2 = theta * theta
+    theta3 = theta2 * theta
+    return ((2 * theta3 - 3 * theta2 + 1) * y0 + (theta3 - 2 * theta2 + theta) * h * dy0
+            + (-2 * theta3 + 3 * theta2) * y1 + (theta3 - theta2) * h * dy1)
+
+def _impact(advance, t, state, h, new_state):
+    # The ground (y = 0) was crossed inside the step: locate the crossing on
+    # the Hermite interpolant, integrate exactly that far from the start of
+    # the step, then remove the tiny remaining height with one Newton step.
+    # Returns the impact time and the landed state.
+    low = np.zeros_like(h)
+    high = np.ones_like(h)
+    for _ in range(50):
+        middle = (low + high) / 2
+        above = _hermite(state[1], state[3], new_state[1], new_state[3], h, middle) > 0
+        low = np.where(above, middle, low)
+        high = np.where(above, high, middle)
+    tau = h * (low + high) / 2
+    landed = advance(t, state, tau)
+    correction = -landed[1] / np.where(landed[3] != 0, landed[3], -1.0)
+    landed[0] += landed[2] * correction
+    landed[1] = 0.0
+    return t + tau + correction, landed
+
+def _launch_state(speeds, heights, angles, parameters):
+    # (x, y, vx, vy) rows for the batch; rejects what would never land
+    v, h0, θ = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (speeds, heights, np.radians(angles))))
+    v, h0, θ = v.ravel(), h0.ravel(), θ.ravel()
+    if not (np.isfinite(v).all() and np.isfinite(h0).all() and np.isfinite(θ).all()):
+        raise ValueError("speeds, heights and angles must be finite")
+    if (h0 < 0).any():
+        raise ValueError("heights cannot be negative")
+    for value in parameters:
+        if not callable(value) and not np.isfinite(np.asarray(value, dtype=float)).all():
+            raise ValueError("drag and wind must be finite")
+    return np.array([np.zeros(v.size), h0, v * np.cos(θ), v * np.sin(θ)])
+
+def simulate_batch(speeds, heights, angles, linear_drag=0.0, quadratic_drag=0.0, wind=0.0,
+                   rtol=1e-9, atol=1e-9, max_steps=1_000_000, record=False):
+    # Returns arrays of displacement, flight_time, max_height, steps and
+    # function evaluations per projectile. With record=True, "trajectories"
+    # holds one (t, x, y, vx, vy) array per projectile at the accepted steps,
+    # ending exactly at the impact point.
+    if np is None:
+        raise ImportError("simulate_batch requires NumPy")
+    parameters = (linear_drag, quadratic_drag, wind)
+    state = _launch_state(speeds, heights, angles, parameters)
+    n = state.shape[1]
+    h0 = state[1]
+    t = np.zeros(n)
+    # first guess: a hundredth of the drag-free flight time
+    step = np.maximum((state[3] + np.sqrt(state[3]**2 + 2 * GRAVITATIONAL_ACCELERATION * h0)) / GRAVITATIONAL_ACCELERATION / 100, 1e-6)
+    k1 = _derivatives(t, state, np.arange(n), *parameters)
+
+    displacement = np.zeros(n)
+    flight_time = np.zeros(n)
+    max_height = h0.copy()
+    steps = np.zeros(n, dtype=np.int64)
+    # accepted and rejected steps, so a run of rejections cannot loop forever
+    attempts = np.zeros(n, dtype=np.int64)
+    evaluations = np.ones(n, dtype=np.int64)
+    history = [[(0.0, *state[:, i])] for i in range(n)] if record else None
+    active = np.arange(n)
+
+    while active.size:
+        if attempts[active].max() >= max_steps:
+            raise RuntimeError(f"simulate_batch did not reach the ground within {max_steps} steps")
+        attempts[active] += 1
+        index = active
+        f = lambda time, s: _derivatives(time, s, index, *parameters)
+        t_a, state_a, h_a, k1_a = t[index], state[:, index], step[index], k1[:, index]
+        new_state, k7, error = _dormand_prince_step(f, t_a, state_a, h_a, k1_a)
+        evaluations[index] += 6
+        scale = atol + rtol * np.maximum(np.abs(state_a), np.abs(new_state))
+        error_norm = np.sqrt(np.mean((error / scale)**2, axis=0))
+        if not np.isfinite(error_norm).all():
+            # e.g. a wind or drag function of time that returned nan
+            raise RuntimeError("simulate_batch produced a non-finite state")
+        accepted = error_norm <= 1
+        with np.errstate(divide="ignore"):
+            factor = np.clip(0.9 * error_norm**-0.2, 0.2, 5.0)
+
+        # apex: vertical speed changes sign inside an accepted step
+        peak = accepted & (state_a[3] > 0) & (new_state[3] <= 0)
+        if peak.any():
+            theta = state_a[3, peak] / (state_a[3, peak] - new_state[3, peak])
+            apex = _hermite(state_a[1, peak], state_a[3, peak], new_state[1, peak], new_state[3, peak], h_a[peak], theta)
+            max_height[index[peak]] = np.maximum(max_height[index[peak]], apex)
+
+        hit = accepted & (new_state[1] < 0)
+        if hit.any():
+            def advance(time, s, tau, hit_index=index[hit]):
+                g = lambda time, s: _derivatives(time, s, hit_index, *parameters)
+                return _dormand_prince_step(g, time, s, tau, g(time, s))[0]
+            impact_time, landed = _impact(advance, t_a[hit], state_a[:, hit], h_a[hit], new_state[:, hit])
+            evaluations[index[hit]] += 8
+            flight_time[index[hit]] = impact_time
+            displacement[index[hit]] = landed[0]
+            steps[index[hit]] += 1
+            if record:
+                for i, time, point in zip(index[hit], impact_time, landed.T):
+                    history[i].append((time, *point))
+
+        moving = accepted & ~hit
+        moved = index[moving]
+        t[moved] = t_a[moving] + h_a[moving]
+        state[:, moved] = new_state[:, moving]
+        k1[:, moved] = k7[:, moving]
+        steps[moved] += 1
+        if record:
+            for i in moved:
+                history[i].append((t[i], *state[:, i]))
+        step[index] = h_a * factor
+        active = index[~hit]
+
+    result = {
+        "displacement": displacement,
+        "flight_time": flight_time,
+        "max_height": max_height,
+        "steps": steps,
+        "evaluations": evaluations,
+    }
+    if record:
+        result["trajectories"] = [np.array(points) for points in history]
+    return result
+
+def simulate_batch_fixed_step(speeds, heights, angles, dt, linear_drag=0.0, quadratic_drag=0.0, wind=0.0):
+    # Classical RK4 with a constant step, for comparison with simulate_batch.
+    if np is None:
+        raise ImportError("simulate_batch_fixed_step requires NumPy")
+    if not dt > 0:
+        raise ValueError("dt must be positive")
+    parameters = (linear_drag, quadratic_drag, wind)
+    state = _launch_state(speeds, heights, angles, parameters)
+    n = state.shape[1]
+    t = np.zeros(n)
+    k1 = _derivatives(t, state, np.arange(n), *parameters)
+    displacement = np.zeros(n)
+    steps = np.zeros(n, dtype=np.int64)
+    active = np.arange(n)
+    while active.size:
+        index = active
+        f = lambda time, s: _derivatives(time, s, index, *parameters)
+        h = np.full(index.size, dt)
+        new_state, k_end = _rk4_step(f, t[index], state[:, index], h, k1[:, index])
+        if not np.isfinite(new_state).all():
+            raise RuntimeError("simulate_batch_fixed_step produced a non-finite state")
+        hit = new_state[1] < 0
+        if hit.any():
+            def advance(time, s, tau, hit_index=index[hit]):
+                g = lambda time, s: _derivatives(time, s, hit_index, *parameters)
+                return _rk4_step(g, time, s, tau, g(time, s))[0]
+            displacement[index[hit]] = _impact(advance, t[index[hit]], state[:, index[hit]], h[hit], new_state[:, hit])[1][0]
+        moving = ~hit
+        t[index[moving]] += dt
+        state[:, index[moving]] = new_state[:, moving]
+        k1[:, index[moving]] = k_end[:, moving]
+        steps[index] += 1
+        active = index[moving]
+    return {"displacement": displacement, "steps": steps}
+
+class DragProjectile:
+    # Same public API as Projectile (speed/height/angle, str(), and
+    # calculate_all_coordinates() for Graph), computed by simulate_batch.
+    __slots__ = ('__speed', '__height', '__angle', '__linear_drag', '__quadratic_drag', '__wind', '__result')
+
+    def __init__(self, speed, height, angle, linear_drag=0.0, quadratic_drag=0.0, wind=0.0):
+        self.__speed = speed
+        self.__height = height
+        self.__angle = angle
+        self.__linear_drag = linear_drag
+        self.__quadratic_drag = quadratic_drag
+        self.__wind = wind
+        self.__result = None
+
+    def __simulate(self):
+        if self.__result is None:
+            self.__result = simulate_batch(
+                self.__speed, self.__height, self.__angle,
+                self.__linear_drag, self.__quadratic_drag, self.__wind, record=True,
+            )
+        return self.__result
+
+    def __str__(self):
+        return f"\nProjectile details:\nspeed: {self.speed} m/s\nheight: {self.height} m\nangle: {round(self.angle)}°\ndisplacement: {self.displacement:.1f} m\n"
+
+    @property
+    def displacement(self):
+        return float(self.__simulate()["displacement"][0])
+
+    def calculate_all_coordinates(self):
+        # y at every whole metre of x while the projectile keeps moving
+        # forwards, interpolated between the integrator's steps with cubic
+        # Hermite polynomials in x (slope vy / vx). A headwind can stop it
+        # and blow it back, so x is no function of the flight any more: then
+        # the path is sampled evenly in time instead, about one point per
+        # metre travelled, and x is a float that may be negative.
+        t, x, y, vx, vy = self.__simulate()["trajectories"][0].T
+        if not np.all(vx > 0):
+            travelled = np.hypot(np.diff(x), np.diff(y)).sum()
+            ts = np.linspace(0, t[-1], max(math.ceil(travelled), 2))
+            segment = np.clip(np.searchsorted(t, ts, side="right") - 1, 0, len(t) - 2)
+            step = t[segment + 1] - t[segment]
+            theta = np.where(step > 0, (ts - t[segment]) / np.where(step > 0, step, 1), 0)
+            xs = _hermite(x[segment], vx[segment], x[segment + 1], vx[segment + 1], step, theta)
+            ys = _hermite(y[segment], vy[segment], y[segment + 1], vy[segment + 1], step, theta)
+            return [(float(x_i), float(y_i)) for x_i, y_i in zip(xs, ys)]
+        xs = np.arange(math.ceil(x[-1]), dtype=float)
+        segment = np.clip(np.searchsorted(x, xs, side="right") - 1, 0, len(x) - 2)
+        width = x[segment + 1] - x[segment]
+        theta = np.where(width > 0, (xs - x[segment]) / np.where(width > 0, width, 1), 0)
+        ys = _hermite(y[segment], vy[segment] / vx[segment], y[segment + 1], vy[segment + 1] / vx[segment + 1], width, theta)
+        return [(int(x_i), float(y_i)) for x_i, y_i in zip(xs, ys)]
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @property
+    def height(self):
+        return self.__height
+
+    @property
+    def angle(self):
+        return self.__angle
+
+    @speed.setter
+    def speed(self, value):
+        self.__speed = value
+        self.__result = None
+
+    @height.setter
+    def height(self, value):
+        self.__height = value
+        self.__result = None
+
+    @angle.setter
+    def angle(self, value):
+        self.__angle = value
+        self.__result = None
+
+    def __repr__(self):
+        return f'DragProjectile({self.speed}, {self.height}, {self.angle}, {self.__linear_drag}, {self.__quadratic_drag}, {self.__wind})'
+
+def benchmark(count=1000):
+    import time
+
+    rng = np.random.default_rng(0)
+    speeds = rng.uniform(20, 300, count)
+    heights = rng.uniform(0, 50, count)
+    angles = rng.uniform(5, 80, count)
+    drag = {"quadratic_drag": 2e-4, "wind": -5.0}
+
+    reference = simulate_batch(speeds, heights, angles, rtol=1e-12, atol=1e-12, **drag)["displacement"]
+    print(f"{count} projectiles in lockstep, quadratic drag and headwind")
+    for tolerance in (1e-4, 1e-6, 1e-8, 1e-10):
+        start = time.perf_counter()
+        adaptive = simulate_batch(speeds, heights, angles, rtol=tolerance, atol=tolerance, **drag)
+        elapsed = time.perf_counter() - start
+        error = np.max(np.abs(adaptive["displacement"] - reference))
+        print(f"RK45 rtol={tolerance:g}: max error {error:.1e} m, {adaptive['steps'].mean():.0f} steps, "
+              f"{adaptive['evaluations'].mean():.0f} evaluations per projectile, {elapsed:.3f} s")
+
+        # halve the fixed step until it is as accurate as the adaptive run
+        dt = 8.0
+        while True:
+            start = time.perf_counter()
+            fixed = simulate_batch_fixed_step(speeds, heights, angles, dt, **drag)
+            elapsed = time.perf_counter() - start
+            fixed_error = np.max(np.abs(fixed["displacement"] - reference))
+            if fixed_error <= error or dt < 1e-4:
+                break
+            dt /= 2
+        print(f"  RK4 dt={dt:g}: max error {fixed_error:.1e} m, {fixed['steps'].mean():.0f} steps, "
+              f"{4 * fixed['steps'].mean():.0f} evaluations per projectile, {elapsed:.3f} s")
+
+class TargetingTable:
+    # Displacement precomputed over a (speed, height, angle) grid, for fast
+    # repeated aiming where there is no closed form (with drag) or where
+    # queries repeat. Between grid points the distance-versus-angle curve is
+    # interpolated bilinearly in speed and height and linearly in angle, so
+    # answers are approximate; a finer grid is more accurate. Pass the drag
+    # arguments of simulate_batch to tabulate drag, otherwise the drag-free
+    # formula is used. Results are memoised in an LRU cache per table.
+    def __init__(self, speeds, heights, angles=None, cache_size=4096, **drag):
+        if np is None:
+            raise ImportError("TargetingTable requires NumPy")
+        self.speeds = np.asarray(speeds, dtype=float)
+        self.heights = np.asarray(heights, dtype=float)
+        self.angles = np.linspace(0, 90, 361) if angles is None else np.asarray(angles, dtype=float)
+        if min(self.speeds.size, self.heights.size, self.angles.size) < 2:
+            raise ValueError("Every axis of the table needs at least two points")
+        grid = np.meshgrid(self.speeds, self.heights, self.angles, indexing="ij")
+        if drag:
+            distances = simulate_batch(*grid, rtol=1e-8, atol=1e-8, **drag)["displacement"]
+        else:
+            distances = calculate_batch(*grid)["displacement"]
+        self.distances = distances.reshape(grid[0].shape)
+        self.launch_angles = functools.lru_cache(maxsize=cache_size)(self.__launch_angles)
+        self.maximum_range = functools.lru_cache(maxsize=cache_size)(self.__maximum_range)
+
+    def __curve(self, speed, height):
+        # distance for every tabulated angle at this speed and height
+        weights = []
+        for axis, value, name in ((self.speeds, speed, "speed"), (self.heights, height, "height")):
+            if not axis[0] <= value <= axis[-1]:
+                raise ValueError(f"{name} {value} is outside the table ({axis[0]:g} to {axis[-1]:g})")
+            i = min(max(np.searchsorted(axis, value) - 1, 0), axis.size - 2)
+            # distance grows roughly with speed² and √height, so interpolate
+            # in those coordinates
+            scale = np.square if name == "speed" else np.sqrt
+            low, high = scale(axis[i:i + 2])
+            weights.append((i, (scale(value) - low) / (high - low)))
+        (i, s), (j, t) = weights
+        d = self.distances
+        return ((1 - s) * (1 - t) * d[i, j] + s * (1 - t) * d[i + 1, j]
+                + (1 - s) * t * d[i, j + 1] + s * t * d[i + 1, j + 1])
+
+    def __launch_angles(self, speed, height, distance):
+        # same contract as the module-level launch_angles
+        curve = self.__curve(speed, height)
+        peak = int(np.argmax(curve))
+        if distance > curve[peak]:
+            return ()
+        angles = []
+        if distance >= curve[0]:
+            angles.append(float(np.interp(distance, curve[:peak + 1], self.angles[:peak + 1])))
+        if distance >= curve[-1] and peak < curve.size - 1:
+            angles.append(float(np.interp(distance, curve[peak:][::-1], self.angles[peak:][::-1])))
+        return tuple(angles)
+
+    def __maximum_range(self, speed, height):
+        # same contract as the module-level maximum_range, with a parabola
+        # through the largest tabulated distance and its neighbours
+        curve = self.__curve(speed, height)
+        k = int(np.clip(np.argmax(curve), 1, curve.size - 2))
+        left, middle, right = curve[k - 1:k + 2]
+        curvature = left - 2 * middle + right
+        offset = 0.5 * (left - right) / curvature if curvature < 0 else 0.0
+        spacing = (self.angles[k + 1] - self.angles[k - 1]) / 2
+        return float(self.angles[k] + offset * spacing), float(middle - (left - right) * offset / 4)
+
+def benchmark_targeting(queries=20000):
+    import time
+
+    rng = np.random.default_rng(0)
+    speeds = rng.uniform(20, 100, queries)
+    heights = rng.uniform(0, 50, queries)
+    distances = rng.uniform(0.1, 1, queries) * np.array([maximum_range(v, h)[1] for v, h in zip(speeds, heights)])
+    # a fire-control loop revisits a few hundred distinct targets
+    repeated = rng.integers(0, 500, queries)
+    requests = [(float(speeds[i]), float(heights[i]), float(distances[i])) for i in range(queries)]
+    repeated_requests = [requests[i] for i in repeated]
+
+    start = time.perf_counter()
+    table = TargetingTable(np.linspace(20, 100, 33), np.linspace(0, 50, 21))
+    print(f"drag-free table {table.distances.shape}: built in {time.perf_counter() - start:.3f} s")
+
+    def run(label, solve, batch):
+        start = time.perf_counter()
+        for request in batch:
+            solve(*request)
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed / len(batch) * 1e6:.2f} µs per query")
+
+    launch_angles.cache_clear()
+    run("closed form, distinct queries", launch_angles.__wrapped__, requests)
+    run("closed form, repeated queries (LRU)", launch_angles, repeated_requests)
+    run("table, distinct queries", table.launch_angles.__wrapped__, requests)
+    run("table, repeated queries (LRU)", table.launch_angles, repeated_requests)
+
+    # how far the table's answers land from the target
+    miss = []
+    for speed, height, distance in requests[:2000]:
+        angles = table.launch_angles(speed, height, distance)
+        if angles:
+            landed = calculate_batch(speed, height, angles[0])["displacement"]
+            miss.append(abs(float(landed) - distance) / distance)
+    print(f"table low-angle miss: median {np.median(miss):.1e}, max {np.max(miss):.1e} (relative)")
+
+    start = time.perf_counter()
+    drag_table = TargetingTable(np.linspace(20, 100, 17), np.linspace(0, 50, 6), np.linspace(0, 90, 91), quadratic_drag=2e-3)
+    print(f"quadratic drag table {drag_table.distances.shape}: built in {time.perf_counter() - start:.3f} s")
+    miss = []
+    for speed, height, distance in requests[:200]:
+        angles = drag_table.launch_angles(speed, height, distance / 3)
+        if angles:
+            landed = simulate_batch(speed, height, angles[0], quadratic_drag=2e-3)["displacement"]
+            miss.append(abs(float(landed[0]) - distance / 3) / (distance / 3))
+    print(f"drag table low-angle miss: median {np.median(miss):.1e}, max {np.max(miss):.1e} (relative)")
+
 class Graph:
     __slots__ = ('__coordinates')
         
@@ -81,15 +603,20 @@ class Graph:
     def __repr__(self):
         return f'Graph({self.__coordinates})'
     
+    def write_coordinates_table(self, stream):
+        stream.write("\n  x      y\n")
+        # whole metres print as before, sampled (float) x compactly
+        stream.writelines(f"{x if isinstance(x, int) else format(x, 'g'):>3}{y:>7.2f}\n" for x, y in self.__coordinates)
+
     def create_coordinates_table(self):
-        table = "\n  x      y\n"
-        for x, y in self.__coordinates:
-            table += f"{x:>3}{y:>7.2f}\n"
-            
-        return table
+        table = io.StringIO()
+        self.write_coordinates_table(table)
+        return table.getvalue()
         
     def create_trajectory(self):
-        rounded_coords = [(round(x), round(y)) for x, y in self.__coordinates]
+        # shifted so that paths blown back behind the launch point fit too
+        x_min = min(round(x) for x, y in self.__coordinates)
+        rounded_coords = [(round(x) - x_min, round(y)) for x, y in self.__coordinates]
         x_max = max(x for x, y in rounded_coords)
         y_max = max(y for x, y in rounded_coords)
         
@@ -106,6 +633,36 @@ class Graph:
         graph = "\n" + "\n".join(matrix_axes) + "\n"
                     
         return graph
+
+    def write_trajectory(self, stream, width=80, height=20):
+        # Draws the trajectory into a fixed width x height character grid,
+        # scaling both axes so the whole flight fits. Only the cells that are
+        # hit are stored (row -> set of columns), so memory and output size
+        # depend on the grid, not on how many metres the shot covers.
+        x_min = min((x for x, y in self.__coordinates), default=0)
+        x_max = max((x for x, y in self.__coordinates), default=0)
+        y_max = max((y for x, y in self.__coordinates), default=0)
+        x_scale = (width - 1) / (x_max - x_min) if x_max > x_min else 0
+        y_scale = (height - 1) / y_max if y_max > 0 else 0
+
+        canvas = {}
+        for x, y in self.__coordinates:
+            row = round(max(y, 0) * y_scale)
+            canvas.setdefault(row, set()).add(round((x - x_min) * x_scale))
+
+        stream.write("\n")
+        blank = " " * width
+        for row in range(height - 1, -1, -1):
+            columns = canvas.get(row)
+            if columns is None:
+                line = blank
+            else:
+                cells = [" "] * width
+                for column in columns:
+                    cells[column] = PROJECTILE
+                line = "".join(cells)
+            stream.write(f"{y_axis_tick}{line}\n")
+        stream.write(f" {x_axis_tick * width}\n")
     
 def main():
     print("This is a module for calculating projectile trajectories.")
@@ -135,8 +692,15 @@ def main():
                     print(projectile)
                     coordinates = projectile.calculate_all_coordinates()
                     graph = Graph(coordinates)
-                    print(graph.create_coordinates_table())
-                    print(graph.create_trajectory())
+                    graph.write_coordinates_table(sys.stdout)
+                    columns, lines = shutil.get_terminal_size()
+                    width, height = max(columns - 2, 10), max(lines - 4, 5)
+                    if np is not None:
+                        # a couple of samples per cell is enough for the plot,
+                        # however many metres the shot covers
+                        x, y = projectile.sample_trajectory(points=2 * (width + height))
+                        graph = Graph(list(zip(x.tolist(), y.tolist())))
+                    graph.write_trajectory(sys.stdout, width=width, height=height)
                     
                 else:
                     print("Invalid choice. Please select 1 or 2.")
@@ -146,4 +710,8 @@ def main():
             print("Invalid input. Please enter numeric values.")    
             
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+        benchmark_targeting()
+    else:
+        main()
\ No newline at end of file
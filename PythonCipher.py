@@ -1,29 +1,96 @@
 # بسم الله الرحمن الرحيم
 
-نص = str(input("ادخل النص اخى المسلم:🙏🙏🙏"))
+import functools
+import io
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # only the cryptanalysis needs NumPy
+    np = None
+
 مفتاح_معدل = "جهنم"
 
-def خل(رسالة, مفتاح, اتجاه=1):
-    مؤشر_المفتاح = 0
-    الابجدية = 'ابتثجحخدذرزسشصضطظعغفقكلمنه'
-    الرسالة_النهائية = ''
-
-    for حرف in رسالة.lower():
-        # إضافة أي حرف غير حرفي إلى الرسالة.
-        if not حرف.isalpha(): # if حرف  == " ":
-            الرسالة_النهائية += حرف
-        else:
-            # ابحث عن الحرف الصحيح للترميز/فك التشفير
-            حرف_مفتاح = مفتاح[مؤشر_المفتاح % len(مفتاح)]
-            مؤشر_المفتاح += 1
+# الابجديات المدعومة؛ ويمكن تمرير أي سلسلة من حروف غير مكررة كأبجدية مخصصة
+ابجدية_عربية = 'ابتثجحخدذرزسشصضطظعغفقكلمنه'
+ابجدية_لاتينية = 'abcdefghijklmnopqrstuvwxyz'
+ابجديات = {
+    "عربية": ابجدية_عربية,
+    "لاتينية": ابجدية_لاتينية,
+}
+
+@functools.lru_cache(maxsize=None)
+def جداول_الازاحة(ابجدية, اتجاه=1):
+    # جدول ترجمة (str.translate) لكل حرف مفتاح في الابجدية، يُحسب مرة واحدة
+    if len(set(ابجدية)) != len(ابجدية):
+        raise ValueError("الابجدية فيها حروف مكررة")
+    طول = len(ابجدية)
+    return {
+        حرف_مفتاح: str.maketrans(ابجدية, ''.join(ابجدية[(فِهرِس + ازاحة * اتجاه) % طول] for فِهرِس in range(طول)))
+        for ازاحة, حرف_مفتاح in enumerate(ابجدية)
+    }
+
+class محرك_فيجنير:
+    # يشفر ويفك على دفعات: الحروف المتتالية تُجمع في سلسلة واحدة، ثم يُترجم
+    # كل موضع من مواضع المفتاح بشريحة واحدة (حروف[بداية::طول_المفتاح]) دفعة
+    # واحدة بدلا من البحث عن كل حرف في الابجدية. ما ليس في الابجدية يمر كما
+    # هو ولا يحرك مؤشر المفتاح.
+    def __init__(self, مفتاح, ابجدية=ابجدية_عربية, تصغير=True):
+        self.تصغير = تصغير
+        مفتاح = مفتاح.lower() if تصغير else مفتاح
+        if not مفتاح or any(حرف not in ابجدية for حرف in مفتاح):
+            raise ValueError("كل حروف المفتاح يجب أن تكون من الابجدية")
+        self.مفتاح = مفتاح
+        self.ابجدية = ابجدية
+        self.جداول = {
+            اتجاه: [جداول_الازاحة(ابجدية, اتجاه)[حرف] for حرف in مفتاح]
+            for اتجاه in (1, -1)
+        }
+        self.نمط_الفواصل = re.compile(f"([^{re.escape(ابجدية)}]+)")
+
+    def خل_قطع(self, قطع, اتجاه=1):
+        # مولد: يأخذ قطعا نصية ويعطي القطع المحولة بالترتيب نفسه
+        جداول = self.جداول[اتجاه]
+        طول_المفتاح = len(جداول)
+        مؤشر_المفتاح = 0
+        for قطعة in قطع:
+            if self.تصغير:
+                قطعة = قطعة.lower()
+            # الاجزاء الزوجية حروف والفردية فواصل
+            اجزاء = self.نمط_الفواصل.split(قطعة)
+            حروف = ''.join(اجزاء[::2])
+            ناتج = [''] * len(حروف)
+            for موضع, جدول in enumerate(جداول):
+                بداية = (موضع - مؤشر_المفتاح) % طول_المفتاح
+                ناتج[بداية::طول_المفتاح] = حروف[بداية::طول_المفتاح].translate(جدول)
+            حروف = ''.join(ناتج)
+            مؤشر_المفتاح = (مؤشر_المفتاح + len(حروف)) % طول_المفتاح
 
-            # تحديد الإزاحة والحرف المشفر/المفكوك التشفير
-            ازاحة = الابجدية.index(حرف_مفتاح)
-            فِهرِس = الابجدية.find(حرف)
-            فهرس_جديد = (فِهرِس + ازاحة * اتجاه) % len(الابجدية)
-            الرسالة_النهائية += الابجدية[فهرس_جديد]
+            بداية = 0
+            for رقم in range(0, len(اجزاء), 2):
+                نهاية = بداية + len(اجزاء[رقم])
+                اجزاء[رقم] = حروف[بداية:نهاية]
+                بداية = نهاية
+            yield ''.join(اجزاء)
 
-    return الرسالة_النهائية
+    def خل_نص(self, نص, اتجاه=1):
+        return ''.join(self.خل_قطع([نص], اتجاه))
+
+    def خل_تدفق(self, مدخل, مخرج, اتجاه=1, حجم_القطعة=1 << 20):
+        # من ملف نصي مفتوح إلى آخر، بذاكرة ثابتة مهما كان حجم الملف
+        قطع = iter(lambda: مدخل.read(حجم_القطعة), '')
+        for قطعة in self.خل_قطع(قطع, اتجاه):
+            مخرج.write(قطعة)
+
+    def خل_ملف(self, مسار_الدخل, مسار_الخرج, اتجاه=1, حجم_القطعة=1 << 20, ترميز='utf-8'):
+        # newline='' حتى تبقى نهايات الاسطر كما هي
+        with open(مسار_الدخل, encoding=ترميز, newline='') as مدخل, \
+                open(مسار_الخرج, 'w', encoding=ترميز, newline='') as مخرج:
+            self.خل_تدفق(مدخل, مخرج, اتجاه, حجم_القطعة)
+
+def خل(رسالة, مفتاح, اتجاه=1):
+    return محرك_فيجنير(مفتاح).خل_نص(رسالة, اتجاه)
 
 def شفر(رسالة, مفتاح):
     return خل(رسالة, مفتاح)
@@ -32,7 +99,148 @@ def شفر(رسالة, مفتاح):
 def فك_تشفير(رسالة, مفتاح):
     return خل(رسالة, مفتاح, -1)
 
-print(f"النص المشفر اخي المسلم: {نص}")
-print(f"المفتاح: {مفتاح_معدل}")
-فك_التشفير = فك_تشفير(نص, مفتاح_معدل)
-print(f"النص المفكوك: {فك_التشفير}\n")
+# نسب الحروف المئوية في نصوص عادية، للمقارنة بمربع كاي. العربية تقريبية، ويمكن
+# حساب نسب أدق من نص مرجعي بالدالة ترددات_من_نص
+ترددات_معروفة = {
+    ابجدية_عربية: dict(zip(ابجدية_عربية, (
+        12.5, 3.8, 3.6, 0.5, 1.2, 1.9, 0.7, 2.5, 0.8, 4.6, 0.5, 2.3, 0.9,
+        1.0, 0.5, 0.9, 0.2, 3.3, 0.4, 2.9, 2.1, 2.3, 11.0, 6.3, 5.8, 4.3,
+    ))),
+    ابجدية_لاتينية: dict(zip(ابجدية_لاتينية, (
+        8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+        6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074,
+    ))),
+}
+
+def مؤشرات_الحروف(نص, ابجدية=ابجدية_عربية, تصغير=True):
+    # موقع كل حرف من الابجدية فيها، مع حذف ما سواه، كمصفوفة NumPy
+    if np is None:
+        raise ImportError("cryptanalysis requires NumPy")
+    if تصغير:
+        نص = نص.lower()
+    نقاط = np.frombuffer(نص.encode('utf-32-le'), dtype=np.uint32)
+    جدول = np.full(max(map(ord, ابجدية)) + 1, -1, dtype=np.int16)
+    جدول[[ord(حرف) for حرف in ابجدية]] = np.arange(len(ابجدية))
+    مؤشرات = جدول[np.minimum(نقاط, len(جدول) - 1)]
+    # آخر خانة في الجدول حرف من الابجدية، فلا تُحسب لها النقاط الاكبر منها
+    مؤشرات[نقاط >= len(جدول)] = -1
+    return مؤشرات[مؤشرات >= 0]
+
+def ترددات_من_نص(نص, ابجدية=ابجدية_عربية):
+    عدد = np.bincount(مؤشرات_الحروف(نص, ابجدية), minlength=len(ابجدية))
+    return عدد / عدد.sum()
+
+def _ترددات(ابجدية, ترددات):
+    if ترددات is None:
+        if ابجدية not in ترددات_معروفة:
+            raise ValueError("لا توجد ترددات معروفة لهذه الابجدية، مرر ترددات")
+        ترددات = ترددات_معروفة[ابجدية]
+    if isinstance(ترددات, dict):
+        ترددات = [ترددات.get(حرف, 0) for حرف in ابجدية]
+    ترددات = np.asarray(ترددات, dtype=float)
+    return ترددات / ترددات.sum()
+
+def _عدد_الاعمدة(مؤشرات, طول_المفتاح, حجم):
+    # عدد كل حرف في كل عمود (الحروف التي شُفرت بالحرف نفسه من المفتاح)
+    # الحروف صفوفا بطول المفتاح، وما بقي في آخر النص يُضاف وحده
+    تمام = مؤشرات.size - مؤشرات.size % طول_المفتاح
+    اعمدة = np.arange(طول_المفتاح, dtype=np.int32) * حجم
+    عدد = np.bincount((مؤشرات[:تمام].reshape(-1, طول_المفتاح) + اعمدة).ravel(), minlength=طول_المفتاح * حجم)
+    عدد[اعمدة[:مؤشرات.size - تمام] + مؤشرات[تمام:]] += 1
+    return عدد.reshape(طول_المفتاح, حجم)
+
+def مؤشرات_التطابق(مؤشرات, حجم, اقصى_طول=20):
+    # متوسط مؤشر التطابق للاعمدة لكل طول مفتاح من 1 إلى اقصى_طول
+    نتائج = np.zeros(اقصى_طول)
+    for طول in range(1, اقصى_طول + 1):
+        عدد = _عدد_الاعمدة(مؤشرات, طول, حجم).astype(float)
+        مجموع = عدد.sum(axis=1)
+        # الاعمدة التي فيها أقل من حرفين لا مؤشر لها، وإن لم يبق عمود فالنتيجة nan
+        كاف = مجموع > 1
+        if كاف.any():
+            نتائج[طول - 1] = ((عدد[كاف] * (عدد[كاف] - 1)).sum(axis=1) / (مجموع[كاف] * (مجموع[كاف] - 1))).mean()
+        else:
+            نتائج[طول - 1] = np.nan
+    return نتائج
+
+def تقدير_طول_المفتاح(نص, ابجدية=ابجدية_عربية, اقصى_طول=20):
+    return _طول_المفتاح(مؤشرات_الحروف(نص, ابجدية), len(ابجدية), اقصى_طول)
+
+def _طول_المفتاح(مؤشرات, حجم, اقصى_طول):
+    # أقصر طول يقترب فيه مؤشر التطابق من أعلى قيمة: مضاعفات الطول الصحيح تعطي
+    # القيمة العالية نفسها، أما قواسمه فتخلط في كل عمود م إزاحة فيقع مؤشرها
+    # عند 1 / م تقريبا من المسافة بين النص العشوائي (1 / حجم الابجدية) والقمة
+    # ومع أقل من حرفين لا يمكن التقدير فيكون الطول 1
+    if مؤشرات.size < 2:
+        return 1
+    اقصى_طول = max(1, min(اقصى_طول, مؤشرات.size // 2))
+    تطابق = مؤشرات_التطابق(مؤشرات, حجم, اقصى_طول)
+    قمة = np.nanmax(تطابق)
+    عشوائي = 1 / حجم
+    # في النصوص القصيرة قد تكون القمة دون العشوائي، فلا يتجاوز الحد القمة
+    حد = min(قمة, عشوائي + 0.75 * (قمة - عشوائي))
+    return int(np.flatnonzero(تطابق >= حد)[0]) + 1
+
+def استعادة_المفتاح(نص, طول_المفتاح=None, ابجدية=ابجدية_عربية, ترددات=None, اقصى_طول=20):
+    # لكل عمود: الازاحة التي تجعل تردداته أقرب إلى اللغة بمقياس مربع كاي
+    حجم = len(ابجدية)
+    مؤشرات = مؤشرات_الحروف(نص, ابجدية)
+    if طول_المفتاح is None:
+        طول_المفتاح = _طول_المفتاح(مؤشرات, حجم, اقصى_طول)
+    متوقع = np.maximum(_ترددات(ابجدية, ترددات), 1e-6)
+    عدد = _عدد_الاعمدة(مؤشرات, طول_المفتاح, حجم)
+    if not عدد.sum(axis=1).all():
+        raise ValueError("النص قصير جدا: في بعض اعمدة المفتاح لا توجد حروف من الابجدية")
+    # ازاحات[ز, ح] = (ح - ز) % حجم: الحرف الاصلي للحرف المشفر ح بالازاحة ز
+    ازاحات = (np.arange(حجم)[None, :] - np.arange(حجم)[:, None]) % حجم
+    نسب = متوقع[ازاحات]
+    مجموع = عدد.sum(axis=1)[:, None, None]
+    كاي = ((عدد[:, None, :] - مجموع * نسب) ** 2 / (مجموع * نسب)).sum(axis=2)
+    return ''.join(ابجدية[ازاحة] for ازاحة in كاي.argmin(axis=1))
+
+def كسر(نص, ابجدية=ابجدية_عربية, ترددات=None, اقصى_طول=20):
+    # (المفتاح المستعاد، النص المفكوك به)
+    مفتاح = استعادة_المفتاح(نص, None, ابجدية, ترددات, اقصى_طول)
+    return مفتاح, محرك_فيجنير(مفتاح, ابجدية).خل_نص(نص, -1)
+
+def قياس_الاداء(عدد_الحروف=10_000_000):
+    import random
+    import time
+
+    for اسم, ابجدية, مفتاح in (("عربية", ابجدية_عربية, مفتاح_معدل), ("لاتينية", ابجدية_لاتينية, "lemon")):
+        مولد = random.Random(0)
+        # كلمات عشوائية بترددات اللغة حتى يكون للتحليل معنى
+        ترددات = ترددات_معروفة[ابجدية]
+        كلمات = [''.join(مولد.choices(list(ترددات), list(ترددات.values()), k=مولد.randint(1, 9))) for _ in range(5000)]
+        نص = ' '.join(مولد.choices(كلمات, k=عدد_الحروف // 6))
+        محرك = محرك_فيجنير(مفتاح, ابجدية)
+
+        بداية = time.perf_counter()
+        مشفر = محرك.خل_نص(نص)
+        زمن_التشفير = time.perf_counter() - بداية
+
+        مخرج = io.StringIO()
+        بداية = time.perf_counter()
+        محرك.خل_تدفق(io.StringIO(مشفر), مخرج, -1)
+        زمن_الفك = time.perf_counter() - بداية
+        assert مخرج.getvalue() == نص
+
+        print(f"{اسم}: تشفير {len(نص) / زمن_التشفير / 1e6:.1f} مليون حرف/ثانية، "
+              f"فك على دفعات {len(نص) / زمن_الفك / 1e6:.1f} مليون حرف/ثانية")
+
+        if np is not None:
+            بداية = time.perf_counter()
+            مفتاح_مستعاد = استعادة_المفتاح(مشفر, ابجدية=ابجدية)
+            زمن_الكسر = time.perf_counter() - بداية
+            print(f"{اسم}: كسر المفتاح {'صحيح' if مفتاح_مستعاد == مفتاح else 'خطأ'} "
+                  f"في {زمن_الكسر:.2f} ثانية ({len(نص) / زمن_الكسر / 1e6:.1f} مليون حرف/ثانية)")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        قياس_الاداء()
+    else:
+        نص = str(input("ادخل النص اخى المسلم:🙏🙏🙏"))
+        print(f"النص المشفر اخي المسلم: {نص}")
+        print(f"المفتاح: {مفتاح_معدل}")
+        فك_التشفير = فك_تشفير(نص, مفتاح_معدل)
+        print(f"النص المفكوك: {فك_التشفير}\n")
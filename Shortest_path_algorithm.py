@@ -1,3 +1,8 @@
+import heapq
+import itertools
+import sys
+from collections.abc import Mapping
+
 my_graph = {
     'A': [('B', 5), ('C', 3), ('E', 11)],
     'B': [('A', 5), ('C', 1), ('F', 2)],
@@ -7,12 +12,83 @@ my_graph = {
     'F': [('B', 2), ('D', 3)]
 }
 
+class ShortestPaths(Mapping):
+    # node -> path from start, rebuilt from the predecessors only when asked
+    # for; unreachable nodes map to [] like the paths of shortest_path
+    __slots__ = ('__nodes', '__predecessors')
+
+    def __init__(self, nodes, predecessors):
+        self.__nodes = nodes
+        self.__predecessors = predecessors
+
+    def __getitem__(self, node):
+        if node not in self.__nodes:
+            raise KeyError(node)
+        path = []
+        if node in self.__predecessors:
+            while node is not None:
+                path.append(node)
+                node = self.__predecessors[node]
+            path.reverse()
+        return path
+
+    def __iter__(self):
+        return iter(self.__nodes)
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+def dijkstra(graph, start, target=''):
+    # Same (distances, paths) result as shortest_path, without printing.
+    # Nodes are settled in order of distance from a heap, with stale heap
+    # entries skipped; each node only remembers its predecessor. With a
+    # target the search stops once the target is settled, so distances are
+    # final only for nodes no farther than the target.
+    distances = {node: float('inf') for node in graph}
+    distances[start] = 0
+    predecessors = {start: None}
+    settled = set()
+    # the counter breaks distance ties without comparing nodes
+    order = itertools.count()
+    heap = [(0, next(order), start)]
+
+    while heap:
+        distance, _, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        settled.add(current)
+        if current == target:
+            break
+        for node, weight in graph.get(current, ()):
+            new_distance = distance + weight
+            if new_distance < distances.get(node, float('inf')):
+                distances[node] = new_distance
+                predecessors[node] = current
+                heapq.heappush(heap, (new_distance, next(order), node))
+
+    return distances, ShortestPaths(distances, predecessors)
+
 def shortest_path(graph, start, target = ''):
+    distances, paths = dijkstra(graph, start, target)
+
+    targets_to_print = [target] if target else graph
+    for node in targets_to_print:
+        if node == start:
+            continue
+        print(f'\n{start}-{node} distance: {distances[node]}\nPath: {" -> ".join(paths[node])}')
+
+    return distances, paths
+
+def _shortest_path_scan(graph, start):
+    # the original O(V²) version, kept for the benchmark
     unvisited = list(graph)
     distances = {node: 0 if node == start else float('inf') for node in graph}
     paths = {node: [] for node in graph}
     paths[start].append(start)
-    
+
     while unvisited:
         current = min(unvisited, key=distances.get)
         for node, distance in graph[current]:
@@ -24,13 +100,52 @@ def shortest_path(graph, start, target = ''):
                     paths[node].extend(paths[current])
                 paths[node].append(node)
         unvisited.remove(current)
-    
-    targets_to_print = [target] if target else graph
-    for node in targets_to_print:
-        if node == start:
-            continue
-        print(f'\n{start}-{node} distance: {distances[node]}\nPath: {" -> ".join(paths[node])}')
-    
+
     return distances, paths
-    
-shortest_path(my_graph, 'A')
\ No newline at end of file
+
+def random_graph(nodes, edges, seed=0):
+    # directed graph with random weights 1-100, every node on a cycle so that
+    # all of them are reachable
+    import random
+
+    rng = random.Random(seed)
+    graph = {node: [((node + 1) % nodes, rng.randint(1, 100))] for node in range(nodes)}
+    for _ in range(edges - nodes):
+        graph[rng.randrange(nodes)].append((rng.randrange(nodes), rng.randint(1, 100)))
+    return graph
+
+def benchmark():
+    import time
+
+    graph = random_graph(2_000, 20_000)
+    start = time.perf_counter()
+    expected, _ = _shortest_path_scan(graph, 0)
+    scan_time = time.perf_counter() - start
+    start = time.perf_counter()
+    distances, _ = dijkstra(graph, 0)
+    heap_time = time.perf_counter() - start
+    assert distances == expected
+    print(f"2k nodes, 20k edges: list scan {scan_time:.3f} s, heap {heap_time:.3f} s")
+
+    for nodes in (100_000, 300_000):
+        graph = random_graph(nodes, 1_000_000)
+        start = time.perf_counter()
+        distances, paths = dijkstra(graph, 0)
+        elapsed = time.perf_counter() - start
+        farthest = max(distances, key=distances.get)
+        start = time.perf_counter()
+        path = paths[farthest]
+        path_time = time.perf_counter() - start
+        print(f"{nodes:,} nodes, 1M edges: all distances {elapsed:.2f} s, "
+              f"path to the farthest node ({len(path)} nodes) rebuilt in {path_time * 1e6:.0f} µs")
+
+        target = nodes // 2
+        start = time.perf_counter()
+        dijkstra(graph, 0, target)
+        print(f"  stopping at node {target}: {time.perf_counter() - start:.2f} s")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+    else:
+        shortest_path(my_graph, 'A')